@@ -1 +1,3 @@
 from .generator import MOABulkGenerator
+from .arff_handling import load_dataset, DatasetPublisher, SharedDatasetHandle
+from .moa_handling import DatasetIndex
@@ -2,6 +2,8 @@ import argparse
 import sys
 from . import MOABulkGenerator
 from .dataset_defs import DatasetObject
+from .moa_handling import CostEstimator
+from .moa_handling.utils import format_estimate
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -29,6 +31,67 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--out", type=str, help="Specify output directory other than default."
     )
+    p.add_argument(
+        "--evaluate",
+        nargs="+",
+        metavar="LEARNER",
+        help="Evaluate the specified MOA learners (e.g. trees.HoeffdingTree) on every dataset with EvaluatePrequential instead of generating the datasets.",
+    )
+    p.add_argument(
+        "--sample-frequency",
+        type=int,
+        default=1000,
+        help="Number of samples between two measurements of the learning curves in evaluation mode.",
+    )
+    p.add_argument(
+        "--write-datasets",
+        action="store_true",
+        help="In evaluation mode, additionally write the datasets to ARFF files.",
+    )
+    p.add_argument(
+        "--part-rows",
+        type=int,
+        help="Split every generated dataset into part files of at most the specified number of rows.",
+    )
+    p.add_argument(
+        "--part-bytes",
+        type=int,
+        help="Split every generated dataset into part files of at most the specified number of bytes.",
+    )
+    p.add_argument(
+        "--layout",
+        choices=["flat", "sharded"],
+        default="flat",
+        help="Layout of the output directory. The sharded layout places datasets in hashed subdirectories and writes an index.jsonl manifest.",
+    )
+    p.add_argument(
+        "--generation-workers",
+        type=int,
+        default=1,
+        help="Number of MOA processes generating datasets at the same time.",
+    )
+    p.add_argument(
+        "--post-processing-workers",
+        type=int,
+        default=1,
+        help="Number of generated datasets post-processed at the same time, overlapping with generation.",
+    )
+    p.add_argument(
+        "--drift-strategy",
+        choices=["nested", "flat"],
+        default="nested",
+        help="How concept drifts are generated. 'flat' generates every classification function once and interleaves the samples, so datasets with many drifts are not slower to generate.",
+    )
+    p.add_argument(
+        "--no-progress",
+        action="store_true",
+        help="Disable live progress and ETA reporting during generation.",
+    )
+    p.add_argument(
+        "--stats",
+        action="store_true",
+        help="Compute drift-verification statistics for every generated dataset.",
+    )
     p.add_argument(
         '--list',
         '-l',
@@ -53,9 +116,11 @@ def main():
                 print(f'\t {key}:{generatos[gen][key]}')
     elif(args.validate):
         datasets, errors = MOABulkGenerator.validate_datasets(args.validate)
+        estimator = CostEstimator()
         print('Valid datasets:')
         for dataset in datasets:
-            print(f'\t {dataset.to_string()}')
+            print(f'\t {dataset.to_string()} ({format_estimate(estimator.estimate(dataset))})')
+        print(f'Estimated total: {format_estimate(estimator.estimate_batch(datasets))}')
         print('Errors:')
         for error in errors:
             print(f'\t {error}')
@@ -65,6 +130,17 @@ def main():
             datasets=args.datasets,
             out=args.out,
             config=args.config,
+            progress=not args.no_progress,
+            statistics=args.stats,
+            part_rows=args.part_rows,
+            part_bytes=args.part_bytes,
+            learners=args.evaluate,
+            sample_frequency=args.sample_frequency,
+            write_datasets=args.write_datasets,
+            layout=args.layout,
+            generation_workers=args.generation_workers,
+            post_processing_workers=args.post_processing_workers,
+            drift_strategy=args.drift_strategy,
         )
         moa.run()
 
@@ -0,0 +1,4 @@
+from .types import ArffAttributeDict, SharedArrayDict
+from .arff_header import read_arff_header
+from .arff_loader import ArffDataset, load_dataset, read_arff_data
+from .shared_dataset import DatasetPublisher, SharedDatasetHandle, SharedDataset
@@ -0,0 +1,47 @@
+from .types import ArffAttributeDict
+
+
+def read_arff_header(path: str) -> tuple[list[ArffAttributeDict], int]:
+    """
+    Parses the header of an ARFF file, without reading the data section.
+
+    Parameters:
+        path (str): Path to the ARFF file
+
+    Returns:
+        tuple[list[ArffAttributeDict], int]: A list of attributes in the order of the data columns, and the byte offset right after the @data line
+    """
+    attributes = []
+    with open(path, "rb") as f:
+        while True:
+            raw = f.readline()
+            if not raw:
+                raise Exception(f"No @data section found in {path}")
+            line = raw.decode("utf-8").strip()
+            lower = line.lower()
+            if lower.startswith("@attribute"):
+                attributes.append(_parse_attribute(line[len("@attribute"):].strip()))
+            elif lower.startswith("@data"):
+                return (attributes, f.tell())
+
+
+def _parse_attribute(definition: str) -> ArffAttributeDict:
+    if definition[0] in "'\"":
+        end = definition.index(definition[0], 1)
+        name = definition[1:end]
+        rest = definition[end + 1:].strip()
+    else:
+        name, rest = definition.split(None, 1)
+
+    if rest.startswith("{"):
+        values = [_unquote(v.strip()) for v in rest[1:rest.rindex("}")].split(",")]
+        return {"name": name, "type": "nominal", "values": values}
+    if rest.lower() in ("numeric", "real", "integer"):
+        return {"name": name, "type": "numeric", "values": []}
+    raise Exception(f"Unsupported ARFF attribute type: {rest}")
+
+
+def _unquote(value: str) -> str:
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
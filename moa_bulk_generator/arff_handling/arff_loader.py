@@ -0,0 +1,165 @@
+import os
+from collections.abc import Iterator
+import numpy as np
+import pandas as pd
+from .arff_header import read_arff_header
+from .types import ArffAttributeDict
+
+
+class ArffDataset:
+    """
+    A class representing a dataset loaded from an ARFF file generated by MOA. The data is stored in a single NumPy structured array with one field per attribute: numeric attributes as float64 values and nominal attributes as integer codes indexing the attribute values (-1 for missing or unknown values).
+
+    Attributes:
+        attributes (list[ArffAttributeDict]): Attributes of the dataset in the order of the data columns. The last attribute is the class
+        data (np.ndarray): Structured array with one row per sample. Memory-mapped and read-only when loaded from the cache
+    """
+    attributes: list[ArffAttributeDict]
+    data: np.ndarray
+
+    def __init__(self, attributes: list[ArffAttributeDict], data: np.ndarray):
+        """
+        ArffDataset initialization.
+
+        Parameters:
+            attributes (list[ArffAttributeDict]): Attributes of the dataset in the order of the data columns
+            data (np.ndarray): Structured array with one field per attribute
+        """
+        self.attributes = attributes
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def features(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns all attributes except the class as a single matrix. Nominal attributes are represented by their codes.
+
+        Parameters:
+            out (np.ndarray | None): Preallocated float64 array of shape (number of samples, number of attributes - 1) to write the matrix into, e.g. a view of shared memory. If None, a new array is allocated
+
+        Returns:
+            np.ndarray: float64 array of shape (number of samples, number of attributes - 1)
+        """
+        res = out if out is not None else np.empty((len(self.data), len(self.attributes) - 1), dtype=np.float64)
+        for j, attribute in enumerate(self.attributes[:-1]):
+            res[:, j] = self.data[attribute["name"]]
+        return res
+
+    def labels(self) -> np.ndarray:
+        """
+        Returns the codes of the class attribute. The class values are available in attributes[-1]["values"].
+
+        Returns:
+            np.ndarray: Integer array with one code per sample
+        """
+        return self.data[self.attributes[-1]["name"]]
+
+
+def load_dataset(path: str, cache: bool = True, mmap: bool = True) -> ArffDataset:
+    """
+    Loads an ARFF file generated by MOA. The header is parsed once and the @data section is read in bulk by the C parser of pandas directly into typed arrays.
+    Optionally the parsed data is cached in a {path}.npy file next to the dataset. The cache is used as long as it is not older than the ARFF file, in which case loading costs only parsing the header and mapping the cache into memory.
+
+    Parameters:
+        path (str): Path to the ARFF file
+        cache (bool): Enables/Disables reading and writing the .npy cache
+        mmap (bool): If True, the data loaded from the cache is memory-mapped read-only instead of read into memory
+
+    Returns:
+        ArffDataset: The loaded dataset
+    """
+    attributes, data_offset = read_arff_header(path)
+    cache_path = path + ".npy"
+    mmap_mode = "r" if mmap else None
+    if cache and os.path.isfile(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        return ArffDataset(attributes, np.load(cache_path, mmap_mode=mmap_mode))
+
+    data = _read_data(path, attributes, data_offset)
+    if cache:
+        # Written under a temporary name first, so that an interrupted write never leaves a valid looking cache
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp_path, cache_path)
+        if mmap:
+            data = np.load(cache_path, mmap_mode=mmap_mode)
+    return ArffDataset(attributes, data)
+
+
+def _code_dtype(attribute: ArffAttributeDict) -> np.dtype:
+    if attribute["type"] == "numeric":
+        return np.dtype(np.float64)
+    if len(attribute["values"]) < 2**7:
+        return np.dtype(np.int8)
+    if len(attribute["values"]) < 2**15:
+        return np.dtype(np.int16)
+    return np.dtype(np.int32)
+
+
+def read_arff_data(
+    path: str,
+    attributes: list[ArffAttributeDict] | None = None,
+    data_offset: int | None = None,
+    chunksize: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads the @data section of an ARFF file generated by MOA with the C parser of pandas. Numeric attributes are read as float64 columns and nominal attributes as categorical columns with the values declared in the header, so values not declared there (e.g. missing values) get the code -1.
+    This is the only place parsing ARFF data, shared by loading datasets and computing their statistics.
+
+    Parameters:
+        path (str): Path to the ARFF file
+        attributes (list[ArffAttributeDict] | None): Attributes of the file. If None, the header is parsed
+        data_offset (int | None): Byte offset right after the @data line. If None, the header is parsed
+        chunksize (int | None): Number of rows per yielded frame. If None, the whole data section is yielded as one frame
+
+    Returns:
+        Iterator[pd.DataFrame]: Frames with one column per attribute, in the order of the data. Nothing is yielded if the file holds no samples
+    """
+    if attributes is None or data_offset is None:
+        attributes, data_offset = read_arff_header(path)
+    dtype = {}
+    for i, attribute in enumerate(attributes):
+        if attribute["type"] == "numeric":
+            dtype[i] = np.float64
+        else:
+            dtype[i] = pd.CategoricalDtype(attribute["values"])
+    with open(path, "rb") as f:
+        f.seek(data_offset)
+        try:
+            reader = pd.read_csv(
+                f,
+                header=None,
+                usecols=range(len(attributes)),
+                dtype=dtype,
+                quotechar="'",
+                skip_blank_lines=True,
+                engine="c",
+                chunksize=chunksize,
+            )
+        except pd.errors.EmptyDataError:
+            return
+        if chunksize is None:
+            yield reader
+        else:
+            with reader:
+                yield from reader
+
+
+def _read_data(path: str, attributes: list[ArffAttributeDict], data_offset: int) -> np.ndarray:
+    data_dtype = [(a["name"], _code_dtype(a)) for a in attributes]
+    frame = next(read_arff_data(path, attributes, data_offset), None)
+    if frame is None:
+        return np.empty(0, dtype=data_dtype)
+
+    data = np.empty(len(frame), dtype=data_dtype)
+    for i, attribute in enumerate(attributes):
+        column = frame.iloc[:, i]
+        if attribute["type"] == "numeric":
+            data[attribute["name"]] = column.to_numpy(dtype=np.float64)
+        else:
+            data[attribute["name"]] = column.cat.codes.to_numpy()
+    return data
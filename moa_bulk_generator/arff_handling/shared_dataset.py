@@ -0,0 +1,250 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from multiprocessing import shared_memory
+from .arff_loader import load_dataset
+from .types import ArffAttributeDict, SharedArrayDict
+
+
+class SharedDatasetHandle:
+    """
+    A lightweight, picklable reference to a dataset published by DatasetPublisher. It contains only the location and layout of the published arrays, so it can be sent to worker processes, which attach to the data without copying or parsing it.
+
+    Attributes:
+        dataset (str): Name of the dataset, by default its string definition
+        kind (str): "shm" for arrays stored in multiprocessing.shared_memory blocks, "mmap" for arrays stored in memory-mapped .npy files
+        attributes (list[ArffAttributeDict]): Attributes of the dataset. The last attribute is the class
+        features (SharedArrayDict): Location of the float64 feature matrix
+        labels (SharedArrayDict): Location of the class codes
+    """
+    dataset: str
+    kind: str
+    attributes: list[ArffAttributeDict]
+    features: SharedArrayDict
+    labels: SharedArrayDict
+
+    def __init__(
+        self,
+        dataset: str,
+        kind: str,
+        attributes: list[ArffAttributeDict],
+        features: SharedArrayDict,
+        labels: SharedArrayDict,
+    ):
+        """
+        SharedDatasetHandle initialization. Handles are created by DatasetPublisher.publish.
+
+        Parameters:
+            dataset (str): Name of the dataset
+            kind (str): "shm" or "mmap"
+            attributes (list[ArffAttributeDict]): Attributes of the dataset
+            features (SharedArrayDict): Location of the feature matrix
+            labels (SharedArrayDict): Location of the class codes
+        """
+        self.dataset = dataset
+        self.kind = kind
+        self.attributes = attributes
+        self.features = features
+        self.labels = labels
+
+    def __repr__(self) -> str:
+        return f"SharedDatasetHandle({self.dataset!r}, kind={self.kind!r}, rows={self.labels['shape'][0]})"
+
+    def attach(self) -> "SharedDataset":
+        """
+        Attaches to the published arrays without copying them. Must be called while the publisher is open.
+
+        Returns:
+            SharedDataset: Read-only view of the published dataset. Should be closed when no longer needed
+        """
+        blocks = []
+        if self.kind == "shm":
+            blocks = [_attach_shared_memory(self.features["name"]), _attach_shared_memory(self.labels["name"])]
+            features = np.ndarray(tuple(self.features["shape"]), dtype=self.features["dtype"], buffer=blocks[0].buf)
+            labels = np.ndarray(tuple(self.labels["shape"]), dtype=self.labels["dtype"], buffer=blocks[1].buf)
+        else:
+            features = np.load(self.features["name"], mmap_mode="r")
+            labels = np.load(self.labels["name"], mmap_mode="r")
+        features.flags.writeable = False
+        labels.flags.writeable = False
+        return SharedDataset(self, features, labels, blocks)
+
+
+class SharedDataset:
+    """
+    A dataset attached to from a SharedDatasetHandle. The arrays are read-only views of the published memory, shared by all processes attached to the same handle.
+    After close() the arrays must not be used anymore, and no references to them (or to slices of them) may be kept, otherwise closing a shared memory block fails with BufferError.
+
+    Attributes:
+        dataset (str): Name of the dataset
+        attributes (list[ArffAttributeDict]): Attributes of the dataset. The last attribute is the class
+        features (np.ndarray | None): float64 matrix of all attributes except the class, None after close()
+        labels (np.ndarray | None): Class codes, indexing attributes[-1]["values"], None after close()
+    """
+    dataset: str
+    attributes: list[ArffAttributeDict]
+    features: np.ndarray | None
+    labels: np.ndarray | None
+    _blocks: list[shared_memory.SharedMemory]
+
+    def __init__(self, handle: SharedDatasetHandle, features: np.ndarray, labels: np.ndarray, blocks: list[shared_memory.SharedMemory]):
+        """
+        SharedDataset initialization. Objects are created by SharedDatasetHandle.attach.
+
+        Parameters:
+            handle (SharedDatasetHandle): Handle the dataset was attached from
+            features (np.ndarray): Feature matrix view
+            labels (np.ndarray): Class codes view
+            blocks (list[shared_memory.SharedMemory]): Attached shared memory blocks backing the views, empty for memory-mapped files
+        """
+        self.dataset = handle.dataset
+        self.attributes = handle.attributes
+        self.features = features
+        self.labels = labels
+        self._blocks = blocks
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Detaches from the published memory. Does not release the memory itself, which is owned by the publisher.
+        """
+        self.features = None
+        self.labels = None
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+
+class DatasetPublisher:
+    """
+    A class publishing the feature and label arrays of generated datasets once, for any number of worker processes to attach to without copying or re-parsing the ARFF files. Arrays are stored either in multiprocessing.shared_memory blocks ("shm") or in memory-mapped .npy files ("mmap").
+    Lifetime rules:
+        1. The publisher owns all published memory. close(), or leaving the with block, releases it: shared memory blocks are unlinked and .npy files are removed
+        2. Workers attach to handles while the publisher is open, and close the attached datasets when done. On POSIX, already attached datasets stay readable after the publisher is closed, until they are closed themselves
+        3. Shared memory blocks are tracked by the resource tracker of the publishing process, so workers using the "shm" kind should be started from it with multiprocessing, e.g. multiprocessing.Pool or concurrent.futures.ProcessPoolExecutor. Unrelated processes should use the "mmap" kind
+
+    Attributes:
+        handles (dict[str, SharedDatasetHandle]): Handles of all published datasets, by dataset name
+    """
+    KINDS: tuple[str, ...] = ("shm", "mmap")
+
+    handles: dict[str, SharedDatasetHandle]
+    _kind: str
+    _directory: str | None
+    _owns_directory: bool
+    _blocks: list[shared_memory.SharedMemory]
+    _files: list[str]
+
+    def __init__(self, kind: str = "shm", directory: str | None = None):
+        """
+        DatasetPublisher initialization.
+
+        Parameters:
+            kind (str): "shm" to publish into shared memory, "mmap" to publish into memory-mapped .npy files
+            directory (str | None): Directory for the .npy files of the "mmap" kind. If None, a temporary directory is created and removed on close
+        """
+        if kind not in DatasetPublisher.KINDS:
+            raise Exception(f"Unsupported kind: {kind}. Supported kinds: {', '.join(DatasetPublisher.KINDS)}")
+        self.handles = {}
+        self._kind = kind
+        self._directory = directory
+        self._owns_directory = False
+        self._blocks = []
+        self._files = []
+        if kind == "mmap":
+            if directory is None:
+                self._directory = tempfile.mkdtemp(prefix="moa_bulk_generator_")
+                self._owns_directory = True
+            else:
+                os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self) -> "DatasetPublisher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def publish(self, name: str, paths: list[str]) -> SharedDatasetHandle:
+        """
+        Loads a generated dataset and publishes its features and labels. The data is written directly into the published memory.
+
+        Parameters:
+            name (str): Name of the dataset, e.g. its string definition
+            paths (list[str]): ARFF files holding the data of the dataset. Part files are concatenated in the given order
+
+        Returns:
+            SharedDatasetHandle: Handle to pass to worker processes
+        """
+        if len(paths) < 1:
+            raise Exception(f"No files to publish for {name}")
+        parts = [load_dataset(path, cache=False) for path in paths]
+        attributes = parts[0].attributes
+        rows = sum(len(part) for part in parts)
+
+        features, features_location = self._allocate(name, "features", (rows, len(attributes) - 1), np.dtype(np.float64))
+        labels, labels_location = self._allocate(name, "labels", (rows,), parts[0].labels().dtype)
+        start = 0
+        for part in parts:
+            end = start + len(part)
+            part.features(out=features[start:end])
+            labels[start:end] = part.labels()
+            start = end
+        if self._kind == "mmap":
+            features.flush()
+            labels.flush()
+
+        handle = SharedDatasetHandle(name, self._kind, attributes, features_location, labels_location)
+        self.handles[name] = handle
+        return handle
+
+    def close(self):
+        """
+        Releases all published memory. Handles cannot be attached to afterwards.
+        """
+        for block in self._blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+        for path in self._files:
+            if os.path.isfile(path):
+                os.remove(path)
+        self._files = []
+        if self._owns_directory and os.path.isdir(self._directory):
+            shutil.rmtree(self._directory)
+        self.handles = {}
+
+    def _allocate(self, name: str, array_name: str, shape: tuple[int, ...], dtype: np.dtype) -> tuple[np.ndarray, SharedArrayDict]:
+        if self._kind == "shm":
+            # Shared memory blocks cannot be empty
+            block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+            self._blocks.append(block)
+            array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            location = block.name
+        else:
+            # File names are derived from a hash, so they do not depend on the length of the dataset name
+            h = hashlib.sha1(name.encode("utf-8")).hexdigest()
+            location = os.path.join(self._directory, f"{h}.{array_name}.npy")
+            array = np.lib.format.open_memmap(location, mode="w+", dtype=dtype, shape=shape)
+            self._files.append(location)
+        return (array, {"name": location, "shape": list(shape), "dtype": dtype.str})
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: the publisher alone is responsible for unlinking the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
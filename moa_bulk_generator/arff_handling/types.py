@@ -0,0 +1,13 @@
+from typing import TypedDict
+
+
+class ArffAttributeDict(TypedDict):
+    name: str
+    type: str
+    values: list[str]
+
+
+class SharedArrayDict(TypedDict):
+    name: str
+    shape: list[int]
+    dtype: str
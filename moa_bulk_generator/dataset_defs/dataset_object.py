@@ -1,17 +1,27 @@
 import math
 import re
+from collections.abc import Sequence
 from .types import DatasetDict, GeneratorInfoDict
 from typeguard import check_type
 
+_STRING_PATTERN = re.compile(
+    r"^(?P<name>[^_]+)"  # generator name (no underscores)
+    r"_f_(?P<f_vals>\d+(?:_\d+)*)"  # f values (one or more ints separated by _)
+    r"(?:_p_(?P<p_vals>\d+(?:_\d+)*)_w_(?P<w_vals>\d+(?:_\d+)*))?"  # optional p and w blocks
+    r"_s_(?P<s>\d+)$"  # final s integer
+)
+
+
 class DatasetObject:
     """
     A class representing a dataset to be generated by MOA. It can be either a simple dataset with one classification function, or a dataset with concept drift at specified points,
+    Objects are immutable and validated once on creation. Equality and hashing are based on the canonical string definition, which is computed once, so objects can be cheaply deduplicated and used as dictionary keys.
 
     Attributes:
         generator (str): Shorthand name of MOA Datastream to be used to generate the dataset.
-        classification_functions (list[int]): A list of all classification functions to be used in generation. If no concept drift should occur, there should be only one value in this list, In case when two consecutive classification functions are equall, the label defintions will switch with each other.
-        drift_points (list[int]): A list of points where the concept drift is to occur. Those points specify at which sample a given concept drift will be centered on.
-        drift_width (list[int]): A list of widths for each concept drift occurences. The width defines over how many samples the drift will occur and allows to choose whether drift should be sudden or gradual,
+        classification_functions (tuple[int, ...]): All classification functions to be used in generation. If no concept drift should occur, there should be only one value, In case when two consecutive classification functions are equall, the label defintions will switch with each other.
+        drift_points (tuple[int, ...]): Points where the concept drift is to occur. Those points specify at which sample a given concept drift will be centered on.
+        drift_width (tuple[int, ...]): Widths for each concept drift occurences. The width defines over how many samples the drift will occur and allows to choose whether drift should be sudden or gradual,
         num_of_samples (int): Number of samples to be generated.
         GENERATORS (dict[str,GeneratorInforDict]): Static member containing information on supported MOA Stream Generators.
     ---
@@ -21,11 +31,22 @@ class DatasetObject:
           {generator}_f_{function}_s_{number of samples}
     ---
     """
+    __slots__ = (
+        "generator",
+        "classification_functions",
+        "drift_points",
+        "drift_widths",
+        "num_of_samples",
+        "_key",
+        "_hash",
+    )
     generator: str
-    classification_functions: list[int]
-    drift_points: list[int]
-    drift_widths: list[int]
+    classification_functions: tuple[int, ...]
+    drift_points: tuple[int, ...]
+    drift_widths: tuple[int, ...]
     num_of_samples: int
+    _key: str
+    _hash: int
     GENERATORS: dict[str,GeneratorInfoDict] = {
         "Agrawal": {"fullName": "AgrawalGenerator", "functions": list(range(1, 12))},
         "STAGGER": {"fullName": "STAGGERGenerator", "functions": list(range(1, 4))},
@@ -36,9 +57,9 @@ class DatasetObject:
         self,
         *,
         generator: str | None = None,
-        classification_functions: list[int] | None = None,
-        drift_points: list[int] | None = None,
-        drift_widths: list[int] | None = None,
+        classification_functions: Sequence[int] | None = None,
+        drift_points: Sequence[int] | None = None,
+        drift_widths: Sequence[int] | None = None,
         num_of_samples: int | None = None,
         dataste_string: str | None = None,
         dataset_dict: DatasetDict | None = None,
@@ -51,9 +72,9 @@ class DatasetObject:
         The priority of generation is as follows: string > dictionary > base values
         Parameters:
             genetor (str): Shorthand name of MOA Datasteream. Available generators are listed in GENERATORS static member
-            classification_functions (list[int]): A list of all classification functions to be used in generation. If no concept drift should occur, there should be only one value in this list, In case when two consecutive classification functions are equall, the label defintions will switch with each other.
-            drift_points (list[int]): A list of points where the concept drift is to occur. Those points specify at which sample a given concept drift will be centered on
-            drift_width (list[int]): A list of widths for each concept drift occurences. The width defines over how many samples the drift will occur and allows to choose whether drift should be sudden or gradual
+            classification_functions (Sequence[int]): A list of all classification functions to be used in generation. If no concept drift should occur, there should be only one value in this list, In case when two consecutive classification functions are equall, the label defintions will switch with each other.
+            drift_points (Sequence[int]): A list of points where the concept drift is to occur. Those points specify at which sample a given concept drift will be centered on
+            drift_width (Sequence[int]): A list of widths for each concept drift occurences. The width defines over how many samples the drift will occur and allows to choose whether drift should be sudden or gradual
             num_of_samples (int): Number of samples to be generated
             dataset_dict (DatasetDict): A dictionary with structure that fullfills the requirements specified by class DatasetDict
             dataset_string (str): A string encoding parameters for the dataset
@@ -76,17 +97,45 @@ class DatasetObject:
             9. The specified number of samples is bigger than zero
         ------
         """
-        self.generator = generator
-        self.classification_functions = classification_functions
-        self.drift_points = drift_points
-        self.drift_widths = drift_widths
-        self.num_of_samples = num_of_samples
         if dataste_string is not None:
-            self._from_string(dataste_string)
+            values = DatasetObject._from_string(dataste_string)
         elif dataset_dict is not None:
-            self._from_dict(dataset_dict)
+            values = DatasetObject._from_dict(dataset_dict)
+        else:
+            values = (generator, classification_functions, drift_points, drift_widths, num_of_samples)
+        generator, classification_functions, drift_points, drift_widths, num_of_samples = values
+
+        object.__setattr__(self, "generator", generator)
+        object.__setattr__(self, "classification_functions", _to_tuple(classification_functions))
+        object.__setattr__(self, "drift_points", _to_tuple(drift_points))
+        object.__setattr__(self, "drift_widths", _to_tuple(drift_widths))
+        object.__setattr__(self, "num_of_samples", num_of_samples)
         self._validate()
 
+        key = self._build_key()
+        object.__setattr__(self, "_key", key)
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetObject is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("DatasetObject is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DatasetObject):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"DatasetObject(dataste_string={self._key!r})"
+
+    def __reduce__(self):
+        return (_from_key, (self._key,))
+
     def check_switching_drift(self) -> bool:
         """
         Checks whether special case of drift where two consecutive classification functions have equal values.
@@ -99,67 +148,48 @@ class DatasetObject:
                 return True
         return False
 
-    def _from_string(self, generator_string: str):
-        pattern = re.compile(
-            r"^(?P<name>[^_]+)"  # generator name (no underscores)
-            r"_f_(?P<f_vals>\d+(?:_\d+)*)"  # f values (one or more ints separated by _)
-            r"(?:_p_(?P<p_vals>\d+(?:_\d+)*)_w_(?P<w_vals>\d+(?:_\d+)*))?"  # optional p and w blocks
-            r"_s_(?P<s>\d+)$"  # final s integer
-        )
-
-        m = pattern.fullmatch(generator_string)
+    @staticmethod
+    def _from_string(generator_string: str) -> tuple:
+        m = _STRING_PATTERN.fullmatch(generator_string)
         if not m:
             raise Exception(f"Invalid string for pasrsing:: {generator_string}")
 
-        self.generator = m.group("name")
-        self.classification_functions = [int(x) for x in m.group("f_vals").split("_")]
+        classification_functions = [int(x) for x in m.group("f_vals").split("_")]
         if m.group("p_vals"):
-            self.drift_points = [int(x) for x in m.group("p_vals").split("_")]
-            self.drift_widths = [int(x) for x in m.group("w_vals").split("_")]
+            drift_points = [int(x) for x in m.group("p_vals").split("_")]
+            drift_widths = [int(x) for x in m.group("w_vals").split("_")]
         else:
-            self.drift_points = []
-            self.drift_widths = []
-        self.num_of_samples = int(m.group("s"))
+            drift_points = []
+            drift_widths = []
+        return (m.group("name"), classification_functions, drift_points, drift_widths, int(m.group("s")))
 
-    def _from_dict(self, generation_dict: DatasetDict):
+    @staticmethod
+    def _from_dict(generation_dict: DatasetDict) -> tuple:
         check_type(generation_dict,DatasetDict)
 
-        self.generator = generation_dict["generator"]
-        self.classification_functions = generation_dict["classification_functions"]
-        if "drift_points" in generation_dict.keys():
-            self.drift_points = generation_dict["drift_points"]
-        else:
-            self.drift_points = []
-        if "drift_widths" in generation_dict.keys():
-            self.drift_widths = generation_dict["drift_widths"]
-        else:
-            self.drift_widths = []
-        self.num_of_samples = int(generation_dict["num_of_samples"])
+        return (
+            generation_dict["generator"],
+            generation_dict["classification_functions"],
+            generation_dict.get("drift_points", []),
+            generation_dict.get("drift_widths", []),
+            int(generation_dict["num_of_samples"]),
+        )
 
     def to_string(self) -> str:
         """
-        Converts the dataset definition into a string that can be used to fully recreate the object.
+        Returns the canonical string definition of the dataset, that can be used to fully recreate the object. The string is computed once on creation.
         
         Returns:
             str: String value like: Agrawal_f_1_s_1000
         """
-        self._validate()
-        res = self.generator + "_"
-
-        res += "f_"
-        for function in self.classification_functions:
-            res += str(function) + "_"
+        return self._key
 
+    def _build_key(self) -> str:
+        res = self.generator + "_f_" + "_".join(map(str, self.classification_functions)) + "_"
         if len(self.drift_points):
-            res += "p_"
-            for point in self.drift_points:
-                res += str(point) + "_"
-
+            res += "p_" + "_".join(map(str, self.drift_points)) + "_"
         if len(self.drift_widths):
-            res += "w_"
-            for width in self.drift_widths:
-                res += str(width) + "_"
-
+            res += "w_" + "_".join(map(str, self.drift_widths)) + "_"
         res += "s_" + str(self.num_of_samples)
         return res
 
@@ -243,3 +273,12 @@ class DatasetObject:
         if self.num_of_samples <= 0:
             raise Exception("Must specify number of samples bigger than one")
 
+
+def _to_tuple(values: Sequence[int] | None) -> tuple[int, ...]:
+    if values is None:
+        return ()
+    return tuple(values)
+
+
+def _from_key(key: str) -> DatasetObject:
+    return DatasetObject(dataste_string=key)
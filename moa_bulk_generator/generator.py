@@ -1,6 +1,7 @@
 import json
 import os
 from .moa_handling import MOAHandler
+from .arff_handling import DatasetPublisher
 from .input_handling import FileInputHandler, InteractiveInputHandler
 from .dataset_defs import DatasetObject
 
@@ -31,6 +32,17 @@ class MOABulkGenerator:
     _interactive: bool
     _dataset_file_path: str
     _out_path: str
+    _progress: bool
+    _statistics: bool
+    _part_rows: int | None
+    _part_bytes: int | None
+    _learners: list[str] | None
+    _sample_frequency: int
+    _write_datasets: bool
+    _layout: str
+    _generation_workers: int
+    _post_processing_workers: int
+    _drift_strategy: str
 
     def __init__(
         self,
@@ -38,6 +50,17 @@ class MOABulkGenerator:
         config: str ="config.json",
         datasets: str = None,
         out: str = "results",
+        progress: bool = True,
+        statistics: bool = False,
+        part_rows: int | None = None,
+        part_bytes: int | None = None,
+        learners: list[str] | None = None,
+        sample_frequency: int = 1000,
+        write_datasets: bool = False,
+        layout: str = "flat",
+        generation_workers: int = 1,
+        post_processing_workers: int = 1,
+        drift_strategy: str = "nested",
     ):
         """
         MOABulkGenerator initialization. 
@@ -47,6 +70,17 @@ class MOABulkGenerator:
             config_path (str): Path to a json file containing the path to execute a java program on user machine and the path to the main MOA directory. If no such file exists, one will be generated on first call.
             dataset_file (str): Path to a txt file containing defintions of the datasets to be generated in the form of strings. The format of the strings is specified below
             out_path (str): Directory where the generated datasets and log file will be saved
+            progress (bool): Enables/Disables live progress and ETA reporting during generation
+            statistics (bool): Enables/Disables computing drift-verification statistics for every generated dataset
+            part_rows (int | None): If specified, every dataset is split into part files of at most this many rows, together with an index file
+            part_bytes (int | None): If specified, every dataset is split into part files of at most this many bytes, together with an index file
+            learners (list[str] | None): If specified, the listed MOA learners are evaluated on every dataset with EvaluatePrequential instead of generating the datasets. Learning curves are saved as csv files
+            sample_frequency (int): Number of samples between two measurements of the learning curves in evaluation mode
+            write_datasets (bool): In evaluation mode, additionally writes the datasets to ARFF files
+            layout (str): Layout of the output directory, "flat" or "sharded". The sharded layout places datasets in hashed subdirectories and records them in an index.jsonl manifest
+            generation_workers (int): Number of MOA processes generating datasets at the same time
+            post_processing_workers (int): Number of generated datasets post-processed in Python (parts, switching drifts, statistics) at the same time, overlapping with generation
+            drift_strategy (str): "nested" generates drifts with nested ConceptDriftStream expressions, "flat" generates every classification function once and interleaves the samples, so the generation cost does not grow with the number of drifts. Evaluation mode always uses nested streams
         
         ------
         Format for string dataset definitons:\n
@@ -58,6 +92,17 @@ class MOABulkGenerator:
 
         self._interactive = interactive
         self._dataset_file_path = datasets
+        self._progress = progress
+        self._statistics = statistics
+        self._part_rows = part_rows
+        self._part_bytes = part_bytes
+        self._learners = learners
+        self._sample_frequency = sample_frequency
+        self._write_datasets = write_datasets
+        self._layout = layout
+        self._generation_workers = generation_workers
+        self._post_processing_workers = post_processing_workers
+        self._drift_strategy = drift_strategy
 
         if out is not None:
             self._out_path = out
@@ -69,9 +114,12 @@ class MOABulkGenerator:
         java_executable, moa_path = self._load_config(config)
         self._moa_handler = MOAHandler(java_executable, moa_path)
 
-    def run(self):
+    def run(self) -> dict[DatasetObject, list[str]]:
         """
         Handles the main functionalities of the script, including loading definitions of datasets, invoking the CLI and generating the datasets. 
+
+        Returns:
+            dict[DatasetObject, list[str]]: Files holding the data of every generated dataset. Empty in evaluation mode
         """
         print('MOA BULK GENERATOR')
         print('All command executions will be logged in log.txt file in the library directory')
@@ -84,7 +132,53 @@ class MOABulkGenerator:
             input_handler = InteractiveInputHandler(datasets)
             datasets = input_handler.run()
 
-        self._moa_handler.generate(datasets, self._out_path)
+        if self._learners:
+            self._moa_handler.evaluate(
+                datasets,
+                self._out_path,
+                self._learners,
+                sample_frequency=self._sample_frequency,
+                write_datasets=self._write_datasets,
+            )
+            return {}
+        return self._moa_handler.generate(
+            datasets,
+            self._out_path,
+            progress=self._progress,
+            statistics=self._statistics,
+            part_rows=self._part_rows,
+            part_bytes=self._part_bytes,
+            layout=self._layout,
+            generation_workers=self._generation_workers,
+            post_processing_workers=self._post_processing_workers,
+            drift_strategy=self._drift_strategy,
+        )
+
+    def publish(
+        self,
+        generated: dict[DatasetObject, list[str]],
+        kind: str = "shm",
+        directory: str | None = None,
+    ) -> DatasetPublisher:
+        """
+        Publishes the feature and label arrays of generated datasets for parallel workers. Every dataset is loaded and parsed once, and workers attach to the published arrays through handles instead of re-reading the files.
+
+        Parameters:
+            generated (dict[DatasetObject, list[str]]): Generated datasets and their files, as returned by run()
+            kind (str): "shm" to publish into multiprocessing.shared_memory, "mmap" to publish into memory-mapped .npy files
+            directory (str | None): Directory for the .npy files of the "mmap" kind. If None, a temporary directory is used
+
+        Returns:
+            DatasetPublisher: Publisher owning the published memory, with a handle for every dataset in its handles attribute, by the string definition of the dataset. The memory is released when the publisher is closed
+        """
+        publisher = DatasetPublisher(kind, directory)
+        try:
+            for dataset, paths in generated.items():
+                publisher.publish(dataset.to_string(), paths)
+        except:
+            publisher.close()
+            raise
+        return publisher
 
     def _load_config(self, config_path: str) -> tuple[str, str]:
         config = None
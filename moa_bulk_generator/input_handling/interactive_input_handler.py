@@ -1,7 +1,13 @@
 from ..dataset_defs import DatasetObject
-from .utils import handle_input, clear_console, handle_input_int
-from .types import CommandDict
+from ..moa_handling.estimator import CostEstimator
+from ..moa_handling.types import CostEstimateDict
+from ..moa_handling.utils import format_estimate
+from .utils import handle_input, clear_console, handle_input_int, handle_input_optional_int, parse_index_selection
+from .types import CommandDict, DatasetFilterDict
+from collections.abc import Sequence
 from typing import Dict
+import fnmatch
+import math
 import uuid
 
 
@@ -9,17 +15,26 @@ import uuid
 class InteractiveInputHandler:
     """
     A class containing all the functionality related to interactive CLI of the script. Supports following functionalities:
-        1. List datasets to generate
-        2. Manually add datasets to generate
-        3. Manually remove chosen datasets from generation
-        4. Display information for a chosen dataset
-        5. Write list of current datasets to a txt file
-        6. Remove all datasets from the list
-        7. Generate listed datasets
+        1. List datasets to generate, one page at a time
+        2. Filter the listed datasets by generator, number of samples or name pattern
+        3. Manually add datasets to generate
+        4. Remove chosen datasets from generation, by index, range or name pattern
+        5. Display information for chosen datasets, by index, range or name pattern
+        6. Write list of current datasets to a txt file
+        7. Remove all datasets from the list
+        8. Generate listed datasets
+    Only the current page is printed and estimated on every redraw. The filtered view and the estimated total of the batch are cached until the list or the filter changes, so redrawing costs the same regardless of the number of datasets.
     """
+    PAGE_SIZE: int = 20
+
     _datasets: list[DatasetObject]
     _commands: Dict[int, CommandDict]
     _running: bool
+    _estimator: CostEstimator
+    _page: int
+    _filter: DatasetFilterDict | None
+    _view: Sequence[int] | None
+    _total_estimate: CostEstimateDict | None
 
     def __init__(self, datasets: list[DatasetObject]):
         """
@@ -31,14 +46,22 @@ class InteractiveInputHandler:
         self._datasets = datasets
         self._commands = {
             "a": {"name": "Add datset", "action": self._add_dataset},
-            "r": {"name": "Remove dataset", "action": self._remove_dataset},
-            "i": {"name": "Inspect dataset", "action": self._inspect_dataset},
+            "r": {"name": "Remove datasets", "action": self._remove_dataset},
+            "i": {"name": "Inspect datasets", "action": self._inspect_dataset},
+            "f": {"name": "Filter list", "action": self._filter_datasets},
+            "n": {"name": "Next page", "action": self._next_page},
+            "p": {"name": "Previous page", "action": self._previous_page},
             "w": {"name": "Write to file", "action": self._write_to_file},
             "c": {"name": "Clear list", "action": self._clear_list},
             "g": {"name": "Generate datasets", "action": self._generate},
             "q": {"name": "Quit", "action": self._exit},
         }
         self._running = False
+        self._estimator = CostEstimator()
+        self._page = 0
+        self._filter = None
+        self._view = None
+        self._total_estimate = None
 
     def run(self) -> list[DatasetObject]:
         """
@@ -63,11 +86,74 @@ class InteractiveInputHandler:
         print("INTERACTIVE MOA BULK GENERATOR")
         print('All command executions will be logged in log.txt file in the library directory')
         print("==========================")
-        print("Datasets to generate:")
-        for i, d in enumerate(self._datasets):
-            print(f"\t{i+1}.{d.to_string()}")
+        view = self._get_view()
+        pages = max(1, math.ceil(len(view) / InteractiveInputHandler.PAGE_SIZE))
+        self._page = min(self._page, pages - 1)
+        if self._filter is None:
+            print(f"Datasets to generate ({len(self._datasets)}):")
+        else:
+            print(f"Datasets to generate ({len(view)} of {len(self._datasets)} matching {self._describe_filter()}):")
+        first = self._page * InteractiveInputHandler.PAGE_SIZE
+        for i in view[first:first + InteractiveInputHandler.PAGE_SIZE]:
+            d = self._datasets[i]
+            print(f"\t{i+1}.{d.to_string()} ({format_estimate(self._estimator.estimate(d))})")
+        if pages > 1:
+            print(f"Page {self._page + 1}/{pages}")
+        if len(self._datasets) > 0:
+            print(f"Estimated total: {format_estimate(self._get_total_estimate())}")
         print("==========================")
 
+    def _get_view(self) -> Sequence[int]:
+        if self._view is None:
+            if self._filter is None:
+                self._view = range(len(self._datasets))
+            else:
+                self._view = [i for i, d in enumerate(self._datasets) if self._matches_filter(d)]
+        return self._view
+
+    def _get_total_estimate(self) -> CostEstimateDict:
+        if self._total_estimate is None:
+            self._total_estimate = self._estimator.estimate_batch(self._datasets)
+        return self._total_estimate
+
+    def _invalidate(self):
+        self._view = None
+        self._total_estimate = None
+
+    def _matches_filter(self, dataset: DatasetObject) -> bool:
+        f = self._filter
+        if f["generator"] is not None and dataset.generator.lower() != f["generator"].lower():
+            return False
+        if f["min_samples"] is not None and dataset.num_of_samples < f["min_samples"]:
+            return False
+        if f["max_samples"] is not None and dataset.num_of_samples > f["max_samples"]:
+            return False
+        if f["pattern"] is not None and not fnmatch.fnmatchcase(dataset.to_string(), f["pattern"]):
+            return False
+        return True
+
+    def _describe_filter(self) -> str:
+        parts = []
+        if self._filter["generator"] is not None:
+            parts.append(f"generator={self._filter['generator']}")
+        if self._filter["min_samples"] is not None:
+            parts.append(f"samples>={self._filter['min_samples']}")
+        if self._filter["max_samples"] is not None:
+            parts.append(f"samples<={self._filter['max_samples']}")
+        if self._filter["pattern"] is not None:
+            parts.append(f"pattern={self._filter['pattern']}")
+        return ", ".join(parts)
+
+    def _select_datasets(self, prompt: str) -> list[int]:
+        # Indices refer to the numbers shown in the list, patterns are matched against the datasets in the current view
+        selection = handle_input(prompt, None).strip()
+        if selection == "":
+            return []
+        indices = parse_index_selection(selection, len(self._datasets))
+        if indices is not None:
+            return indices
+        return [i for i in self._get_view() if fnmatch.fnmatchcase(self._datasets[i].to_string(), selection)]
+
     def _print_commads(self):
         print("Commands:")
         for key, command in self._commands.items():
@@ -138,7 +224,12 @@ class InteractiveInputHandler:
             self._inspect_dataset(dataset)
             to_add = handle_input("Add this dataset to the list?(Y/N)")
             if to_add == "y":
-                self._datasets.append(dataset)
+                if dataset in self._datasets:
+                    print("This dataset is already in the list")
+                    handle_input("Press enter to continue...", None)
+                else:
+                    self._datasets.append(dataset)
+                    self._invalidate()
             clear_console()
 
         except Exception as e:
@@ -151,27 +242,45 @@ class InteractiveInputHandler:
             return
         self._print_headline()
 
-        indices = [str(x) for x in range(1, len(self._datasets) + 1)]
-        to_delete = handle_input(
-            "Specify index of the dataset to delete:", indices, indices[0]
+        indices = self._select_datasets(
+            "Specify datasets to delete (index, range like 3-10, or pattern like Agrawal_*):"
         )
+        if len(indices) < 1:
+            print("No datasets match the selection")
+            handle_input("Press enter to continue...", None)
+            clear_console()
+            return
+        if len(indices) > 1:
+            confirm = handle_input(f"Delete {len(indices)} datasets?(Y/N)")
+            if confirm != "y":
+                clear_console()
+                return
+        to_delete = set(indices)
+        self._datasets = [d for i, d in enumerate(self._datasets) if i not in to_delete]
+        self._invalidate()
         clear_console()
-        self._datasets.pop(int(to_delete) - 1)
 
     def _inspect_dataset(self, dataset_in: DatasetObject | None = None):
         if dataset_in is not None:
-            dataset = dataset_in
-        else:
-            if len(self._datasets) < 1:
-                return
-            self._print_headline()
+            self._print_dataset(dataset_in)
+            return
+        if len(self._datasets) < 1:
+            return
+        self._print_headline()
 
-            indices = [str(x) for x in range(1, len(self._datasets) + 1)]
-            to_show = handle_input(
-                "Specify index of the dataset to inspect:", indices, indices[0]
-            )
-            dataset = self._datasets[int(to_show) - 1]
+        indices = self._select_datasets(
+            "Specify datasets to inspect (index, range like 3-10, or pattern like Agrawal_*):"
+        )
+        if len(indices) < 1:
+            print("No datasets match the selection")
+        elif len(indices) == 1:
+            self._print_dataset(self._datasets[indices[0]])
+        else:
+            self._print_selection([self._datasets[i] for i in indices])
+        handle_input("Press enter to continue...", None)
+        clear_console()
 
+    def _print_dataset(self, dataset: DatasetObject):
         print(f"Name: {dataset.to_string()}")
         print(f'Generaot: {dataset.get_generator_name()}')
         if len(dataset.classification_functions) > 1:
@@ -185,10 +294,51 @@ class InteractiveInputHandler:
         else:
             print(f"Classification function: {dataset.classification_functions[0]}")
         print(f"Number of samples: {dataset.num_of_samples}")
+        print(f"Estimated: {format_estimate(self._estimator.estimate(dataset))}")
 
-        if dataset_in is None:
-            handle_input("Press enter to continue...", None)
-            clear_console()
+    def _print_selection(self, datasets: list[DatasetObject]):
+        generators: dict[str, int] = {}
+        for dataset in datasets:
+            generators[dataset.generator] = generators.get(dataset.generator, 0) + 1
+        print(f"Selected datasets: {len(datasets)}")
+        print("Generators: " + ", ".join(f"{g} ({n})" for g, n in generators.items()))
+        print(f"Number of samples: {min(d.num_of_samples for d in datasets)} - {max(d.num_of_samples for d in datasets)}")
+        print(f"With concept drift: {sum(1 for d in datasets if len(d.drift_points) > 0)}")
+        print(f"With switching drift: {sum(1 for d in datasets if d.check_switching_drift())}")
+        print(f"Estimated total: {format_estimate(self._estimator.estimate_batch(datasets))}")
+        for dataset in datasets[:InteractiveInputHandler.PAGE_SIZE]:
+            print(f"\t{dataset.to_string()}")
+        if len(datasets) > InteractiveInputHandler.PAGE_SIZE:
+            print(f"\t... and {len(datasets) - InteractiveInputHandler.PAGE_SIZE} more")
+
+    def _filter_datasets(self):
+        self._print_headline()
+        print("Leave a field empty to skip it. Leave all fields empty to show all datasets.")
+        generator = handle_input("Generator: ", None).strip()
+        min_samples = handle_input_optional_int("Minimal number of samples: ", min_val=0)
+        max_samples = handle_input_optional_int("Maximal number of samples: ", min_val=0)
+        pattern = handle_input("Name pattern (like Agrawal_f_1_*): ", None).strip()
+
+        dataset_filter: DatasetFilterDict = {
+            "generator": generator if generator else None,
+            "min_samples": min_samples,
+            "max_samples": max_samples,
+            "pattern": pattern if pattern else None,
+        }
+        if all(value is None for value in dataset_filter.values()):
+            self._filter = None
+        else:
+            self._filter = dataset_filter
+        self._page = 0
+        self._view = None
+        clear_console()
+
+    def _next_page(self):
+        # Clamped to the last page on the next redraw
+        self._page += 1
+
+    def _previous_page(self):
+        self._page = max(0, self._page - 1)
 
     def _write_to_file(self):
         path = handle_input("File path to save: ", None)
@@ -208,11 +358,14 @@ class InteractiveInputHandler:
                     for dataset in self._datasets:
                         f.write(dataset.to_string() + "\n")
             self._datasets = []
+            self._invalidate()
             self._running = False
         clear_console()
 
     def _clear_list(self):
         self._datasets = []
+        self._page = 0
+        self._invalidate()
 
     def _generate(self):
         self._running = False
@@ -5,3 +5,10 @@ from collections.abc import Callable
 class CommandDict(TypedDict):
     name: str
     action: Callable
+
+
+class DatasetFilterDict(TypedDict):
+    generator: str | None
+    min_samples: int | None
+    max_samples: int | None
+    pattern: str | None
@@ -1,4 +1,5 @@
 import os
+import sys
 
 
 def handle_input(
@@ -57,5 +58,61 @@ def handle_input_int(
         return response
 
 
+def handle_input_optional_int(prompt: str, min_val: int | None = None) -> int | None:
+    """
+    Helper function for handling user input where the expected response is an integer or nothing. Will repeat the prompt until an empty response or a valid integer is provided.
+
+    Parameters:
+        prompt (str): The message that will be displayed to the user
+        min_val (int | None): Minimum acceptable value. Can be None if there is no lower bound
+
+    Returns:
+        int | None: User response parsed into int, or None if the response was empty
+    """
+    while True:
+        response_str = input(prompt).strip()
+        if response_str == "":
+            return None
+        try:
+            response = int(response_str)
+        except ValueError:
+            print("Must input a number")
+            continue
+
+        if min_val is not None and response < min_val:
+            print(f"Number must be at least {min_val}")
+            continue
+
+        return response
+
+
+def parse_index_selection(selection: str, max_index: int) -> list[int] | None:
+    """
+    Helper function parsing a selection of 1-based indices, like: 3 or 3-10 or 1,4,7-9. Ranges are inclusive.
+
+    Parameters:
+        selection (str): Selection provided by the user
+        max_index (int): Highest valid index
+
+    Returns:
+        list[int] | None: Sorted, 0-based indices without duplicates. None if the selection is not a valid index selection
+    """
+    indices = set()
+    for part in selection.replace(" ", "").split(","):
+        bounds = part.split("-")
+        if len(bounds) > 2 or not all(b.isdigit() for b in bounds):
+            return None
+        first, last = int(bounds[0]), int(bounds[-1])
+        if first < 1 or last > max_index or first > last:
+            return None
+        indices.update(range(first - 1, last))
+    return sorted(indices)
+
+
 def clear_console():
-    os.system("cls" if os.name == "nt" else "clear")
+    if os.name == "nt":
+        os.system("cls")
+        return
+    # Escape sequences avoid spawning a shell for every redraw
+    sys.stdout.write("\033[2J\033[H")
+    sys.stdout.flush()
@@ -1 +1,3 @@
 from .moa_handler import MOAHandler
+from .estimator import CostEstimator
+from .dataset_index import DatasetIndex
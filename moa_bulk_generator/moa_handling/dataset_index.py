@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+from ..dataset_defs import DatasetObject
+from .types import IndexEntryDict, IndexFileDict
+
+INDEX_FILE_NAME = "index.jsonl"
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+def sharded_path(dataset_object: DatasetObject, out_dir: str) -> str:
+    """
+    Returns the path of a dataset in the sharded layout. The file is named after the SHA-1 hash of the dataset definition and placed in two levels of subdirectories named after the first characters of the hash, so every directory stays small and the file name length does not depend on the definition.
+
+    Parameters:
+        dataset_object (DatasetObject): Dataset to place
+        out_dir (str): Run directory
+
+    Returns:
+        str: Path like: out/3f/a2/3fa2...c1.arrf
+    """
+    h = hashlib.sha1(dataset_object.to_string().encode("utf-8")).hexdigest()
+    return f"{out_dir}/{h[:2]}/{h[2:4]}/{h}.arrf"
+
+
+def file_checksum(path: str) -> str:
+    """
+    Computes the SHA-256 checksum of a file, reading it in chunks.
+
+    Parameters:
+        path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the checksum
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHECKSUM_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DatasetIndex:
+    """
+    A class mapping canonical dataset definitions to the files generated for them, so that a dataset can be found without scanning the run directory. The index is stored as an index.jsonl manifest in the run directory, with one line per dataset containing its definition, the path of the dataset file and the size and SHA-256 checksum of every file holding its data (the dataset file itself, or its part files). All paths are relative to the run directory.
+    Lines are appended as soon as a dataset is generated, so an interrupted run still leaves a valid index of the finished datasets. Datasets can be added from multiple threads.
+    """
+    _run_dir: str
+    _index_path: str
+    _entries: dict[str, IndexEntryDict]
+    _lock: threading.Lock
+
+    def __init__(self, run_dir: str):
+        """
+        DatasetIndex initialization. Loads the existing manifest of the run directory, if there is one.
+
+        Parameters:
+            run_dir (str): Run directory containing the datasets and the index.jsonl manifest
+        """
+        self._run_dir = run_dir
+        self._index_path = os.path.join(run_dir, INDEX_FILE_NAME)
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(self._index_path):
+            with open(self._index_path) as f:
+                for line in f:
+                    # The last line may be truncated if a run was interrupted while appending it
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry["dataset"]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, dataset: DatasetObject | str) -> bool:
+        return self._key(dataset) in self._entries
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def add(self, dataset_object: DatasetObject, path: str, data_files: list[str]) -> IndexEntryDict:
+        """
+        Records a generated dataset and appends it to the manifest.
+
+        Parameters:
+            dataset_object (DatasetObject): Generated dataset
+            path (str): Path of the dataset file. For datasets split into parts, the path of the unsplit file, next to which the part index is stored
+            data_files (list[str]): Files holding the data of the dataset, in order
+
+        Returns:
+            IndexEntryDict: The recorded entry
+        """
+        files: list[IndexFileDict] = [
+            {
+                "path": os.path.relpath(data_file, self._run_dir),
+                "bytes": os.path.getsize(data_file),
+                "sha256": file_checksum(data_file),
+            }
+            for data_file in data_files
+        ]
+        entry: IndexEntryDict = {
+            "dataset": dataset_object.to_string(),
+            "path": os.path.relpath(path, self._run_dir),
+            "files": files,
+        }
+        # Checksums are computed before taking the lock, so that concurrent additions only wait for the append
+        with self._lock:
+            with open(self._index_path, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._entries[entry["dataset"]] = entry
+        return entry
+
+    def lookup(self, dataset: DatasetObject | str) -> IndexEntryDict | None:
+        """
+        Finds the entry of a dataset.
+
+        Parameters:
+            dataset (DatasetObject | str): Dataset, or its string definition
+
+        Returns:
+            IndexEntryDict | None: Entry of the dataset, None if the dataset is not in the index
+        """
+        return self._entries.get(self._key(dataset))
+
+    def path(self, dataset: DatasetObject | str) -> str | None:
+        """
+        Finds the path of a dataset file. For datasets split into parts, this is the path of the unsplit file, which no longer exists, and next to which the part index is stored. Use files() to find the files holding the data.
+
+        Parameters:
+            dataset (DatasetObject | str): Dataset, or its string definition
+
+        Returns:
+            str | None: Path of the dataset file, None if the dataset is not in the index
+        """
+        entry = self.lookup(dataset)
+        if entry is None:
+            return None
+        return os.path.join(self._run_dir, entry["path"])
+
+    def files(self, dataset: DatasetObject | str) -> list[str] | None:
+        """
+        Finds the files holding the data of a dataset.
+
+        Parameters:
+            dataset (DatasetObject | str): Dataset, or its string definition
+
+        Returns:
+            list[str] | None: Paths of the dataset file, or of its part files in order, None if the dataset is not in the index
+        """
+        entry = self.lookup(dataset)
+        if entry is None:
+            return None
+        return [os.path.join(self._run_dir, file["path"]) for file in entry["files"]]
+
+    def _key(self, dataset: DatasetObject | str) -> str:
+        if isinstance(dataset, DatasetObject):
+            return dataset.to_string()
+        return dataset
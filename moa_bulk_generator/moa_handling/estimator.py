@@ -0,0 +1,162 @@
+import json
+import os
+from ..dataset_defs import DatasetObject
+from .types import CostEstimateDict, RunMetricsDict
+from .utils import metrics_path, logger
+
+
+class CostEstimator:
+    """
+    A class estimating the output size, runtime and peak memory of dataset generation. The estimates come from a throughput model fitted per generator on the metrics recorded by previous runs, with conservative defaults for generators that were never run.
+    Datasets with switching drifts are modelled separately, since their post-processing in Python dominates the runtime.
+    The model assumes that the runtime and the peak memory of the JVM grow linearly with the number of samples on top of a constant startup cost, and that the output size is proportional to the number of samples.
+    """
+    # Defaults used until the first run of a generator is recorded
+    DEFAULT_BYTES_PER_ROW: dict[str, float] = {"Agrawal": 110.0, "STAGGER": 20.0, "SEA": 45.0}
+    DEFAULT_ROWS_PER_SECOND: float = 100000.0
+    DEFAULT_STARTUP_SECONDS: float = 1.5
+    DEFAULT_PEAK_MEMORY: int = 512 * 1024 * 1024
+    # Factor between the size of the ARFF file and the memory needed to post-process it in Python
+    POST_PROCESSING_MEMORY_FACTOR: float = 3.0
+    MAX_HISTORY: int = 1000
+
+    _metrics_path: str
+    _models: dict[tuple[str, bool], dict[str, float]]
+
+    def __init__(self, path: str | None = None):
+        """
+        CostEstimator initialization. Loads the metrics of previous runs and fits the throughput model for every generator.
+
+        Parameters:
+            path (str | None): Path to the JSON lines file containing metrics of previous runs. By default metrics.jsonl in the library directory
+        """
+        self._metrics_path = path if path is not None else metrics_path
+        self._models = {}
+        history: dict[tuple[str, bool], list[RunMetricsDict]] = {}
+        if os.path.isfile(self._metrics_path):
+            with open(self._metrics_path) as f:
+                for line in f:
+                    try:
+                        metrics = json.loads(line)
+                        key = (metrics["generator"], bool(metrics["switching_drift"]))
+                        history.setdefault(key, []).append(metrics)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        for key, runs in history.items():
+            self._models[key] = self._fit(runs[-CostEstimator.MAX_HISTORY:])
+
+    def record(self, dataset: DatasetObject, seconds: float, size_bytes: int, peak_memory_bytes: int | None):
+        """
+        Appends the metrics of a finished generation to the metrics file, so that they can calibrate future estimates.
+
+        Parameters:
+            dataset (DatasetObject): Generated dataset
+            seconds (float): Time it took to generate and post-process the dataset
+            size_bytes (int): Size of the generated file
+            peak_memory_bytes (int | None): Peak resident memory of the MOA process generating the dataset, None if unknown
+        """
+        metrics: RunMetricsDict = {
+            "generator": dataset.generator,
+            "num_of_samples": dataset.num_of_samples,
+            "switching_drift": dataset.check_switching_drift(),
+            "seconds": seconds,
+            "size_bytes": size_bytes,
+            "jvm_peak_memory_bytes": peak_memory_bytes,
+        }
+        try:
+            with open(self._metrics_path, "a") as f:
+                f.write(json.dumps(metrics) + "\n")
+        except OSError as e:
+            logger.error(f"could not record run metrics: {e}")
+
+    def estimate(self, dataset: DatasetObject) -> CostEstimateDict:
+        """
+        Estimates the cost of generating a single dataset.
+
+        Parameters:
+            dataset (DatasetObject): Dataset to estimate
+
+        Returns:
+            CostEstimateDict: Estimated output size in bytes, runtime in seconds and peak memory in bytes
+        """
+        switching = dataset.check_switching_drift()
+        model = self._models.get((dataset.generator, switching))
+        if model is None:
+            model = self._models.get((dataset.generator, not switching), self._default_model(dataset.generator))
+        rows = dataset.num_of_samples
+        size = model["bytes_per_row"] * rows
+        memory = model["base_memory"] + model["memory_per_row"] * rows
+        if switching:
+            # Switching drifts are applied in Python on the whole dataset loaded into memory
+            memory = max(memory, size * CostEstimator.POST_PROCESSING_MEMORY_FACTOR)
+        return {
+            "size_bytes": int(size),
+            "seconds": model["startup_seconds"] + model["seconds_per_row"] * rows,
+            "peak_memory_bytes": int(memory),
+        }
+
+    def estimate_batch(self, datasets: list[DatasetObject]) -> CostEstimateDict:
+        """
+        Estimates the cost of generating a batch of datasets one after another.
+
+        Parameters:
+            datasets (list[DatasetObject]): Datasets to estimate
+
+        Returns:
+            CostEstimateDict: Total output size and runtime, and the highest peak memory of all datasets
+        """
+        total: CostEstimateDict = {"size_bytes": 0, "seconds": 0.0, "peak_memory_bytes": 0}
+        for dataset in datasets:
+            estimate = self.estimate(dataset)
+            total["size_bytes"] += estimate["size_bytes"]
+            total["seconds"] += estimate["seconds"]
+            total["peak_memory_bytes"] = max(total["peak_memory_bytes"], estimate["peak_memory_bytes"])
+        return total
+
+    def _default_model(self, generator: str) -> dict[str, float]:
+        return {
+            "bytes_per_row": CostEstimator.DEFAULT_BYTES_PER_ROW.get(generator, 100.0),
+            "startup_seconds": CostEstimator.DEFAULT_STARTUP_SECONDS,
+            "seconds_per_row": 1.0 / CostEstimator.DEFAULT_ROWS_PER_SECOND,
+            "base_memory": float(CostEstimator.DEFAULT_PEAK_MEMORY),
+            "memory_per_row": 0.0,
+        }
+
+    def _fit(self, runs: list[RunMetricsDict]) -> dict[str, float]:
+        rows = [r["num_of_samples"] for r in runs]
+        seconds = [r["seconds"] for r in runs]
+        sizes = [r["size_bytes"] for r in runs]
+        # Older records hold lifetime peaks of the whole process, which say nothing about a single dataset
+        measured = [r for r in runs if r.get("jvm_peak_memory_bytes")]
+
+        startup, seconds_per_row = self._fit_linear(rows, seconds, CostEstimator.DEFAULT_STARTUP_SECONDS)
+        if measured:
+            memories = [r["jvm_peak_memory_bytes"] for r in measured]
+            base_memory, memory_per_row = self._fit_linear([r["num_of_samples"] for r in measured], memories, min(memories))
+        else:
+            base_memory, memory_per_row = float(CostEstimator.DEFAULT_PEAK_MEMORY), 0.0
+
+        return {
+            "bytes_per_row": sum(sizes) / sum(rows) if sum(rows) > 0 else CostEstimator.DEFAULT_BYTES_PER_ROW.get(runs[0]["generator"], 100.0),
+            "startup_seconds": startup,
+            "seconds_per_row": seconds_per_row,
+            "base_memory": base_memory,
+            "memory_per_row": memory_per_row,
+        }
+
+    def _fit_linear(self, rows: list[int], values: list[float], default_intercept: float) -> tuple[float, float]:
+        # Least squares fit of value = intercept + slope * rows
+        n = len(rows)
+        mean_rows = sum(rows) / n
+        mean_values = sum(values) / n
+        variance = sum((x - mean_rows) ** 2 for x in rows)
+        intercept = -1.0
+        slope = -1.0
+        if variance > 0:
+            slope = sum((x - mean_rows) * (y - mean_values) for x, y in zip(rows, values)) / variance
+            intercept = mean_values - slope * mean_rows
+        if slope <= 0 or intercept < 0:
+            # Not enough spread in the history to separate the constant part from the per-row part
+            intercept = min(default_intercept, min(values))
+            slope = max(mean_values - intercept, 0.0) / mean_rows if mean_rows > 0 else 0.0
+        return (float(intercept), float(slope))
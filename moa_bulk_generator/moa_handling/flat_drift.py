@@ -0,0 +1,143 @@
+import math
+from itertools import islice
+import numpy as np
+from ..dataset_defs import DatasetObject
+from ..arff_handling import read_arff_header
+from .utils import sigmoid_array
+
+# Drift probabilities below this value are treated as 0, and above 1 minus this value as 1.
+# The expected number of samples affected by the cut tails is below 1e-12 * width
+DRIFT_PROBABILITY_EPSILON = 1e-12
+# Number of samples drawn at once within a drift window
+SOURCE_CHUNK_SIZE = 1 << 20
+
+
+def drift_sources(dataset_object: DatasetObject, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws the concept every sample of a dataset is generated from, following the definition of the drifts on the global sample index: sample i (counted from 1) comes from the concept after drift j with probability sigmoid(i, p_j, w_j), and the last drift taking effect decides the concept.
+    In nested ConceptDriftStream expressions the outermost stream, the last drift, counts every sample, but an inner stream only counts the samples the streams around it pass on. The counter of an inner drift therefore lags behind the global sample index by the number of samples already taken by later drifts, so the gap to the nested strategy is at most the tail probability of the later drifts around the inner drift area. See nested_drift_sources and nested_drift_gap.
+    Random draws are only needed within the window of each drift where its probability is neither 0 nor 1, and not past the point where a later drift is complete. Drift areas do not overlap, so the number of draws is proportional to the number of samples, regardless of the number of drifts.
+
+    Parameters:
+        dataset_object (DatasetObject): Dataset definition
+        rng (np.random.Generator): Source of the random draws
+
+    Returns:
+        np.ndarray: For every sample, the index of its concept in classification_functions
+    """
+    n = dataset_object.num_of_samples
+    points = dataset_object.drift_points
+    widths = dataset_object.drift_widths
+    k = len(points)
+    sources = np.zeros(n, dtype=np.min_scalar_type(k))
+    if k == 0:
+        return sources
+
+    # sigmoid_array(i, p, w) equals epsilon at i = p - reach * w, and 1 - epsilon at i = p + reach * w
+    reach = math.log(1.0 / DRIFT_PROBABILITY_EPSILON - 1.0) / 4.0
+    lows = [max(1, math.floor(p - reach * w)) for p, w in zip(points, widths)]
+    highs = [min(n + 1, math.ceil(p + reach * w)) for p, w in zip(points, widths)]
+    # limits[j] is the first sample from which a later drift is complete, so drift j no longer matters
+    limits = [n + 1] * k
+    for j in range(k - 2, -1, -1):
+        limits[j] = min(limits[j + 1], highs[j + 1])
+
+    for j in range(k):
+        # Samples past the drift window always come from the concept after the drift, until a later drift is complete
+        if highs[j] < limits[j]:
+            sources[highs[j] - 1:limits[j] - 1] = j + 1
+        for start in range(lows[j], min(highs[j], limits[j]), SOURCE_CHUNK_SIZE):
+            end = min(start + SOURCE_CHUNK_SIZE, highs[j], limits[j])
+            i = np.arange(start, end, dtype=np.float64)
+            switch = rng.random(end - start) < sigmoid_array(i, points[j], widths[j])
+            window = sources[start - 1:end - 1]
+            window[switch] = j + 1
+    return sources
+
+
+def nested_drift_sources(dataset_object: DatasetObject, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulates the concept every sample comes from in the nested ConceptDriftStream expression MOA runs for the nested strategy. Every level counts only the samples it is asked for: the outermost level, the last drift, sees every sample, and the samples it does not take are passed on to the next level.
+
+    Parameters:
+        dataset_object (DatasetObject): Dataset definition
+        rng (np.random.Generator): Source of the random draws
+
+    Returns:
+        np.ndarray: For every sample, the index of its concept in classification_functions
+    """
+    k = len(dataset_object.drift_points)
+    sources = np.zeros(dataset_object.num_of_samples, dtype=np.min_scalar_type(k))
+    remaining = np.arange(dataset_object.num_of_samples)
+    for j in range(k - 1, -1, -1):
+        counter = np.arange(1, len(remaining) + 1, dtype=np.float64)
+        switch = rng.random(len(remaining)) < sigmoid_array(counter, dataset_object.drift_points[j], dataset_object.drift_widths[j])
+        sources[remaining[switch]] = j + 1
+        remaining = remaining[~switch]
+    return sources
+
+
+def nested_drift_gap(dataset_object: DatasetObject, repetitions: int, rng: np.random.Generator) -> float:
+    """
+    Checks drift_sources against nested_drift_sources: estimates from repeated draws how often every sample comes from every concept with both, and returns the largest difference.
+
+    Parameters:
+        dataset_object (DatasetObject): Dataset definition
+        repetitions (int): Number of draws of every strategy. Being the largest of many estimated differences, the result includes sampling noise of a few times 1 / sqrt(repetitions)
+        rng (np.random.Generator): Source of the random draws
+
+    Returns:
+        float: Largest difference between the frequencies of a concept at a sample
+    """
+    k = len(dataset_object.drift_points)
+    flat = np.zeros((dataset_object.num_of_samples, k + 1))
+    nested = np.zeros((dataset_object.num_of_samples, k + 1))
+    rows = np.arange(dataset_object.num_of_samples)
+    for _ in range(repetitions):
+        flat[rows, drift_sources(dataset_object, rng)] += 1
+        nested[rows, nested_drift_sources(dataset_object, rng)] += 1
+    return float(np.abs(flat - nested).max() / repetitions)
+
+
+def interleave_arff_files(streams: np.ndarray, stream_files: list[str | None], path: str, relation: str):
+    """
+    Writes an ARFF file whose i-th sample is the next unused sample of the file streams[i]. Samples are copied as written by MOA, and consecutive samples of the same file are copied as one block.
+
+    Parameters:
+        streams (np.ndarray): For every sample, the index of the file in stream_files it is taken from
+        stream_files (list[str | None]): ARFF files with identical attributes, each holding at least as many samples as are taken from it. None for files no sample is taken from
+        path (str): Path of the written file
+        relation (str): Relation name written into the header
+    """
+    first_file = next(f for f in stream_files if f is not None)
+    _, data_offset = read_arff_header(first_file)
+    with open(first_file, "rb") as f:
+        header_lines = f.read(data_offset).splitlines(keepends=True)
+    for i, line in enumerate(header_lines):
+        if line.strip().lower().startswith(b"@relation"):
+            header_lines[i] = b"@relation '" + relation.encode("utf-8") + b"'\n"
+            break
+
+    readers = [_data_lines(f) if f is not None else None for f in stream_files]
+    try:
+        boundaries = np.flatnonzero(np.diff(streams)) + 1
+        starts = np.concatenate(([0], boundaries)).tolist()
+        ends = np.concatenate((boundaries, [len(streams)])).tolist()
+        with open(path, "wb") as dst:
+            # MOA separates the @data line from the samples with an empty line
+            dst.write(b"".join(header_lines) + b"\n")
+            for start, end in zip(starts, ends):
+                dst.writelines(islice(readers[streams[start]], end - start))
+    finally:
+        for reader in readers:
+            if reader is not None:
+                reader.close()
+
+
+def _data_lines(path: str):
+    _, data_offset = read_arff_header(path)
+    with open(path, "rb") as f:
+        f.seek(data_offset)
+        for line in f:
+            if line.strip():
+                yield line if line.endswith(b"\n") else line + b"\n"
@@ -1,10 +1,21 @@
 import os
+import re
+import shutil
+import threading
+import time
 from ..dataset_defs import DatasetObject
 import datetime
 from ..input_handling.utils import handle_input
-from .utils import execute_command, sigmoid
-from scipy.io import arff as scipy_arff
-import pandas as pd
+from .utils import execute_command, sigmoid_array, sigmoid_start, format_size
+from .progress import ProgressReporter
+from .estimator import CostEstimator
+from .statistics import DatasetStatistics
+from .parts import split_dataset_file
+from .dataset_index import DatasetIndex, sharded_path
+from .pipeline import PipelinedExecutor
+from .flat_drift import drift_sources, interleave_arff_files
+from ..arff_handling import read_arff_header
+import numpy as np
 import random
 
 class MOAHandler:
@@ -13,6 +24,16 @@ class MOAHandler:
     """
     _java_executable: str = None
     _MOA_path: str = None
+    # Fraction of the free disk space above which the pre-flight check warns about the estimated output size
+    DISK_SPACE_WARNING_RATIO: float = 0.9
+    LAYOUTS: tuple[str, ...] = ("flat", "sharded")
+    DRIFT_STRATEGIES: tuple[str, ...] = ("nested", "flat")
+    # Number of bytes of whole lines processed at once while switching labels, which bounds the memory of the per-row arrays
+    PATCH_SCAN_CHUNK: int = 1 << 24
+    # Number of bytes searched at once for the end of a line
+    LINE_SEARCH_WINDOW: int = 1 << 16
+    # Seed of the concept draws of the flat drift strategy. Fixed like the default random seeds of MOA, so flat runs are reproducible like nested ones
+    FLAT_DRIFT_SEED: int = 1
 
     def __init__(self, java_path: str, moa_path: str):
         """
@@ -26,14 +47,184 @@ class MOAHandler:
         self._MOA_path = moa_path
         self._validate_MOA()
 
-    def generate(self, datasets: list[DatasetObject], out_dir: str):
+    def generate(
+        self,
+        datasets: list[DatasetObject],
+        out_dir: str,
+        progress: bool = True,
+        check_space: bool = True,
+        statistics: bool = False,
+        part_rows: int | None = None,
+        part_bytes: int | None = None,
+        layout: str = "flat",
+        generation_workers: int = 1,
+        post_processing_workers: int = 1,
+        queue_size: int = 1,
+        drift_strategy: str = "nested",
+    ) -> dict[DatasetObject, list[str]]:
         """
         Creates and executes commands necessary to generate specified datasets using MOA tool.
+        Datasets go through a pipeline of two stages with their own worker threads: generation by MOA, and post-processing in Python (splitting into parts, switching drifts, statistics and the index). Generating the next datasets overlaps with post-processing the previous ones, see PipelinedExecutor.
 
         Parameters:
             datasets (list[DatasetObject]): List of datasets to generate
             out_dir (str): Directory where the generated datasets and log file will be saved
+            progress (bool): Enables/Disables live progress reporting. On a terminal a status line is redrawn in place, otherwise progress is printed as JSON lines
+            check_space (bool): Enables/Disables the pre-flight check of free disk space. When enabled, generation refuses to start if the estimated output size exceeds the free space in out_dir
+            statistics (bool): Enables/Disables computing drift-verification statistics of every generated dataset. The statistics are written to a {dataset file}.stats.json sidecar file and summarized in the log file
+            part_rows (int | None): If specified, every dataset is split into part files of at most this many rows, described by a {dataset file}.index.json index file
+            part_bytes (int | None): If specified, every dataset is split into part files of at most this many bytes of data, described by a {dataset file}.index.json index file
+            layout (str): Layout of the run directory. "flat" places every dataset directly in the run directory under its string definition. "sharded" places datasets in hashed subdirectories and records them in an index.jsonl manifest, see DatasetIndex
+            generation_workers (int): Number of MOA processes running at the same time
+            post_processing_workers (int): Number of datasets post-processed at the same time
+            queue_size (int): Number of generated datasets that can wait for post-processing. When the queue is full, generation pauses until a dataset is post-processed
+            drift_strategy (str): How datasets with concept drifts are generated. "nested" runs MOA once over nested ConceptDriftStream expressions, one level per drift. "flat" draws the concept of every sample in Python, generates every distinct classification function once with MOA and interleaves the samples, so the cost per sample does not depend on the number of drifts
+
+        Returns:
+            dict[DatasetObject, list[str]]: Files holding the data of every generated dataset, in order. A single file, unless the dataset was split into parts. Empty if the output directory was not created
         """
+        if layout not in MOAHandler.LAYOUTS:
+            raise Exception(f"Unsupported layout: {layout}. Supported layouts: {', '.join(MOAHandler.LAYOUTS)}")
+        if drift_strategy not in MOAHandler.DRIFT_STRATEGIES:
+            raise Exception(f"Unsupported drift strategy: {drift_strategy}. Supported strategies: {', '.join(MOAHandler.DRIFT_STRATEGIES)}")
+        # Checked before the first MOA run, otherwise the error would only surface in post-processing
+        if (part_rows is not None and part_rows < 1) or (part_bytes is not None and part_bytes < 1):
+            raise Exception("Part size must be above 0")
+        if not self._ensure_out_dir(out_dir):
+            return {}
+
+        datasets = self._deduplicate(datasets)
+        estimator = CostEstimator()
+        if check_space:
+            self._check_disk_space(estimator, datasets, out_dir, drift_strategy, generation_workers)
+
+        out_dir = self._create_run_dir(out_dir)
+        index = DatasetIndex(out_dir) if layout == "sharded" else None
+
+        reporter = ProgressReporter(datasets) if progress else None
+        if reporter is not None:
+            reporter.start()
+        summaries: dict[DatasetObject, str] = {}
+        lock = threading.Lock()
+
+        def generation_stage(dataset: DatasetObject) -> tuple[str, float, int | None]:
+            if reporter is not None:
+                dataset_path = self._dataset_path(dataset, out_dir, layout)
+                files = None
+                if drift_strategy == "flat" and len(dataset.drift_points) > 0:
+                    # MOA writes the stream files, the dataset file only appears once they are interleaved
+                    files = [self._stream_file_path(dataset_path, f) for f in dict.fromkeys(dataset.classification_functions)]
+                reporter.start_job(dataset, dataset_path, files)
+            else:
+                print(f"generating {dataset.to_string()} to {out_dir}...")
+            stage_start = time.monotonic()
+            dataset_file, peak_memory = self._run_generation(dataset, out_dir, layout, drift_strategy)
+            return (dataset_file, time.monotonic() - stage_start, peak_memory)
+
+        def post_processing_stage(dataset: DatasetObject, generation: tuple[str, float, int | None]) -> list[str]:
+            dataset_file, generation_seconds, peak_memory = generation
+            stage_start = time.monotonic()
+            dataset_files = self._post_process_dataset(dataset, dataset_file, part_rows, part_bytes)
+            with lock:
+                estimator.record(
+                    dataset,
+                    generation_seconds + time.monotonic() - stage_start,
+                    sum(os.path.getsize(path) for path in dataset_files),
+                    peak_memory,
+                )
+            if statistics:
+                dataset_statistics = DatasetStatistics(dataset, dataset_file, dataset_files)
+                dataset_statistics.save()
+                with lock:
+                    summaries[dataset] = dataset_statistics.summary()
+            if index is not None:
+                index.add(dataset, dataset_file, dataset_files)
+            if reporter is not None:
+                reporter.finish_job(dataset)
+            return dataset_files
+
+        executor = PipelinedExecutor(
+            generation_stage,
+            post_processing_stage,
+            generation_workers,
+            post_processing_workers,
+            queue_size,
+        )
+        start_time = datetime.datetime.now()
+        try:
+            generated = executor.run(datasets)
+        finally:
+            if reporter is not None:
+                reporter.close()
+        run_time = datetime.datetime.now() - start_time
+        with open(out_dir + "/log.txt", "w") as f:
+            f.write(f"generation time: {format(run_time)} \n")
+            f.write("datasets:\n")
+            for dataset in datasets:
+                f.write(dataset.to_string() + "\n")
+            if statistics:
+                f.write("statistics:\n")
+                for dataset in datasets:
+                    f.write(summaries[dataset] + "\n")
+        return generated
+
+    def evaluate(
+        self,
+        datasets: list[DatasetObject],
+        out_dir: str,
+        learners: list[str],
+        sample_frequency: int = 1000,
+        write_datasets: bool = False,
+    ):
+        """
+        Evaluates MOA learners on the specified datasets with the EvaluatePrequential task. The task reads the same stream expression that is used to generate the dataset, so the stream is generated and evaluated within a single JVM run, without writing the dataset to a file and reading it back.
+        Switching drifts are applied to an already generated file, so datasets containing them are always generated first and evaluated from the written file.
+
+        Parameters:
+            datasets (list[DatasetObject]): List of datasets to evaluate the learners on
+            out_dir (str): Directory where the learning curves and log file will be saved
+            learners (list[str]): MOA learners to evaluate, e.g. "trees.HoeffdingTree" or "bayes.NaiveBayes". Options of the learner can follow its name, e.g. "trees.HoeffdingTree -g 100"
+            sample_frequency (int): Number of samples between two measurements of the learning curve
+            write_datasets (bool): If True, the datasets are also written to ARFF files, like in generate
+        """
+        if len(learners) < 1:
+            raise Exception("Must provide at least one learner to evaluate")
+        if not self._ensure_out_dir(out_dir):
+            return
+        datasets = self._deduplicate(datasets)
+        out_dir = self._create_run_dir(out_dir)
+
+        start_time = datetime.datetime.now()
+        for dataset in datasets:
+            stream = self._build_stream(dataset)
+            if write_datasets or dataset.check_switching_drift():
+                print(f"generating {dataset.to_string()} to {out_dir}...")
+                self._generate_dataset(dataset, out_dir)
+                if dataset.check_switching_drift():
+                    stream = f"(ArffFileStream -f {self._dataset_path(dataset, out_dir)})"
+            for learner in learners:
+                print(f"evaluating {learner} on {dataset.to_string()}...")
+                evaluation_command = (
+                    f"EvaluatePrequential -l ({learner}) -s {stream}"
+                    f" -i {dataset.num_of_samples} -f {sample_frequency}"
+                    f" -d {self._evaluation_path(dataset, learner, out_dir)}"
+                )
+                full_command = f'{self._base_command()} "{evaluation_command}"'
+                try:
+                    execute_command(full_command)
+                except:
+                    raise Exception(f"Execution of command failed: \n{full_command}")
+        run_time = datetime.datetime.now() - start_time
+        with open(out_dir + "/log.txt", "w") as f:
+            f.write(f"evaluation time: {format(run_time)} \n")
+            f.write("learners:\n")
+            for learner in learners:
+                f.write(learner + "\n")
+            f.write("datasets:\n")
+            for dataset in datasets:
+                f.write(dataset.to_string() + "\n")
+
+    def _ensure_out_dir(self, out_dir: str) -> bool:
         if not os.path.isdir(out_dir):
             to_create = handle_input(
                 f"{os.path.abspath(out_dir)} does not exist. Create directory(Y/N):"
@@ -41,117 +232,331 @@ class MOAHandler:
             if to_create == "y":
                 os.mkdir(out_dir)
             else:
-                return
+                return False
+        return True
 
+    def _create_run_dir(self, out_dir: str) -> str:
         dir_name = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
         out_dir = out_dir + "/" + dir_name
         os.mkdir(out_dir)
+        return out_dir
 
-        start_time = datetime.datetime.now()
-        for dataset in datasets:
-            print(f"generating {dataset.to_string()} to {out_dir}...")
-            self._generate_dataset(dataset, out_dir)
-        run_time = datetime.datetime.now() - start_time
-        with open(out_dir + "/log.txt", "w") as f:
-            f.write(f"generation time: {format(run_time)} \n")
-            f.write("datasets:\n")
-            for dataset in datasets:
-                f.write(dataset.to_string() + "\n")
+    def _deduplicate(self, datasets: list[DatasetObject]) -> list[DatasetObject]:
+        # Equal definitions would be generated to the same file, so only the first occurrence is kept
+        unique = list(dict.fromkeys(datasets))
+        if len(unique) < len(datasets):
+            print(f"skipping {len(datasets) - len(unique)} duplicate dataset definition(s)")
+        return unique
 
-    def _generate_dataset(self, dataset_object: DatasetObject, out_dir: str):
-        command = (
-            self._java_executable
-            + " -cp "
-            + self._MOA_path
-            + "/lib/moa.jar -javaagent:"
-            + self._MOA_path
-            + "/lib/sizeofag-1.1.0.jar moa.DoTask"
-        )
-        generation_command = "WriteStreamToARFFFile "
-        if len(dataset_object.classification_functions) == 1:
-            generation_command += f"-s (generators.{dataset_object.get_generator_name()}) -f {str(dataset_object.classification_functions[0])})"
-        else:
-            generation_command += self._build_command(
-                dataset_object.get_generator_name(),
-                dataset_object.classification_functions,
-                dataset_object.drift_points,
-                dataset_object.drift_widths,
+    def _check_disk_space(self, estimator: CostEstimator, datasets: list[DatasetObject], out_dir: str, drift_strategy: str = "nested", generation_workers: int = 1):
+        required = estimator.estimate_batch(datasets)["size_bytes"]
+        if drift_strategy == "flat":
+            # The stream files of a dataset stay on disk until they are interleaved into the dataset file, so a dataset being generated needs twice its size
+            in_flight = sorted((estimator.estimate(d)["size_bytes"] for d in datasets if len(d.drift_points) > 0), reverse=True)
+            required += sum(in_flight[:generation_workers])
+        free = shutil.disk_usage(out_dir).free
+        if required > free:
+            raise Exception(
+                f"Not enough free space in {os.path.abspath(out_dir)}. Estimated space needed: {format_size(required)}, free space: {format_size(free)}"
             )
+        if required > free * MOAHandler.DISK_SPACE_WARNING_RATIO:
+            print(
+                f"Warning: estimated space needed {format_size(required)} is close to the free space in {os.path.abspath(out_dir)} ({format_size(free)})"
+            )
+
+    def _dataset_path(self, dataset_object: DatasetObject, out_dir: str, layout: str = "flat") -> str:
+        if layout == "sharded":
+            return sharded_path(dataset_object, out_dir)
+        return f"{out_dir}/{dataset_object.to_string()}.arrf"
 
-        generation_command += f" -f {out_dir}/{dataset_object.to_string()}.arrf -m {str(dataset_object.num_of_samples)}"
-        full_command = f'{command} "{generation_command}"'
+    def _evaluation_path(self, dataset_object: DatasetObject, learner: str, out_dir: str) -> str:
+        learner_name = re.sub(r"[^A-Za-z0-9.]+", "_", learner).strip("_")
+        return f"{out_dir}/{dataset_object.to_string()}__{learner_name}.csv"
+
+    def _generate_dataset(
+        self,
+        dataset_object: DatasetObject,
+        out_dir: str,
+        part_rows: int | None = None,
+        part_bytes: int | None = None,
+        layout: str = "flat",
+    ) -> list[str]:
+        dataset_file, _ = self._run_generation(dataset_object, out_dir, layout)
+        return self._post_process_dataset(dataset_object, dataset_file, part_rows, part_bytes)
+
+    def _run_generation(self, dataset_object: DatasetObject, out_dir: str, layout: str = "flat", drift_strategy: str = "nested") -> tuple[str, int | None]:
+        dataset_file = self._dataset_path(dataset_object, out_dir, layout)
+        os.makedirs(os.path.dirname(dataset_file), exist_ok=True)
+        if drift_strategy == "flat" and len(dataset_object.drift_points) > 0:
+            return (dataset_file, self._run_flat_generation(dataset_object, dataset_file))
+        generation_command = f"WriteStreamToARFFFile -s {self._build_stream(dataset_object)}"
+        generation_command += f" -f {dataset_file} -m {str(dataset_object.num_of_samples)}"
+        full_command = f'{self._base_command()} "{generation_command}"'
 
         try:
-            execute_command(full_command)
+            peak_memory = execute_command(full_command)
         except:
             raise Exception(f"Execution of command failed: \n{full_command}")
-        
+        return (dataset_file, peak_memory)
+
+    def _run_flat_generation(self, dataset_object: DatasetObject, dataset_file: str) -> int | None:
+        # Every distinct classification function is generated once, with as many samples as are drawn from it
+        rng = np.random.default_rng(MOAHandler.FLAT_DRIFT_SEED)
+        functions = list(dict.fromkeys(dataset_object.classification_functions))
+        segment_streams = np.array([functions.index(f) for f in dataset_object.classification_functions], dtype=np.min_scalar_type(len(functions)))
+        streams = segment_streams[drift_sources(dataset_object, rng)]
+        counts = np.bincount(streams, minlength=len(functions))
+
+        stream_files = []
+        peak_memories = []
+        try:
+            for function, count in zip(functions, counts.tolist()):
+                if count == 0:
+                    stream_files.append(None)
+                    continue
+                stream_file = self._stream_file_path(dataset_file, function)
+                stream_files.append(stream_file)
+                generation_command = f"WriteStreamToARFFFile -s (generators.{dataset_object.get_generator_name()} -f {function})"
+                generation_command += f" -f {stream_file} -m {count}"
+                full_command = f'{self._base_command()} "{generation_command}"'
+                try:
+                    peak_memories.append(execute_command(full_command))
+                except:
+                    raise Exception(f"Execution of command failed: \n{full_command}")
+            interleave_arff_files(streams, stream_files, dataset_file, dataset_object.to_string())
+        finally:
+            for stream_file in stream_files:
+                if stream_file is not None and os.path.isfile(stream_file):
+                    os.remove(stream_file)
+        # The streams are generated one after another, so the peak of the generation is the highest peak of a single run
+        measured = [m for m in peak_memories if m is not None]
+        return max(measured) if measured else None
+
+    def _stream_file_path(self, dataset_file: str, function: int) -> str:
+        return f"{dataset_file}.f{function}.tmp"
+
+    def _post_process_dataset(
+        self,
+        dataset_object: DatasetObject,
+        dataset_file: str,
+        part_rows: int | None = None,
+        part_bytes: int | None = None,
+    ) -> list[str]:
+        dataset_files = [(dataset_file, 1, dataset_object.num_of_samples)]
+        if part_rows is not None or part_bytes is not None:
+            index = split_dataset_file(dataset_object, dataset_file, part_rows, part_bytes)
+            dataset_files = [
+                (os.path.join(os.path.dirname(dataset_file), part["file"]), part["first_row"], part["last_row"])
+                for part in index["parts"]
+            ]
+
         #Handle switching CD
         if(dataset_object.check_switching_drift()):
-            self._handle_switching_drift(dataset_object, f'{out_dir}/{dataset_object.to_string()}.arrf')
+            self._handle_switching_drift(dataset_object, dataset_files)
+        return [path for path, _, _ in dataset_files]
 
-    def _handle_switching_drift(self, dataset_object: DatasetObject, dataset_file: str):
-        dataset, meta = scipy_arff.loadarff(dataset_file)
-        dataset = pd.DataFrame(dataset)
-
-        classes = dataset.iloc[:,-1].unique()
+    def _handle_switching_drift(self, dataset_object: DatasetObject, dataset_files: list[tuple[str, int, int]]):
+        # Every file comes with the range of rows it contains, so only files overlapping rows affected by a switching drift are loaded and rewritten
+        drifts = []
         for i in range(len(dataset_object.drift_points)):
             if(dataset_object.classification_functions[i] == dataset_object.classification_functions[i+1]):
+                drift = {
+                    "p": dataset_object.drift_points[i],
+                    "w": dataset_object.drift_widths[i],
+                    "p_next": None,
+                    "w_next": None,
+                    "mapping": None,
+                    "finished": False,
+                }
                 if(i<len(dataset_object.drift_points)-1):
-                    self._apply_label_drift(dataset,dataset_object.drift_points[i],dataset_object.drift_widths[i],classes,dataset_object.drift_points[i+1],dataset_object.drift_widths[i+1])
-                else:
-                    self._apply_label_drift(dataset,dataset_object.drift_points[i],dataset_object.drift_widths[i],classes)
-        
-        self._overwrite_arff_file(dataset, meta, dataset_file)
-     
-    def _apply_label_drift(self, dataset: pd.DataFrame, p:int, w:int, classes:list[any], p_next: int|None = None, w_next: int|None = None):
-        if len(classes)>0:
-            perm = classes.copy()
-            while((perm == classes).all()):
-                random.shuffle(perm)
-            mapping = {classes[i]: perm[i] for i in range(len(classes))}
-
-        for i, sample in enumerate(dataset.iloc[:,-1], start=1):
-            prob = sigmoid(i, p, w)
-
-            #handle early exit if the next drift is likely to take effect
-            if(p_next):
-                #probabilty that the sample was classified by the next classification function
-                next_prob = sigmoid(i,p_next,w_next)
-                #If our current drift already occured, and its probability is within the margin of the probability of the next drift, break
-                if(prob > 0.99 and prob-next_prob<0.01):
-                    break
-            if random.random() < prob:
-                dataset.iloc[i-1,-1] = mapping.get(sample)
-            
-    #Important to fit format of arff file generated by MOA
-    def _overwrite_arff_file(self, data:pd.DataFrame, meta_data: scipy_arff.MetaData, path:str):
-        types = meta_data.types()
-
-        file_data = []
-        with open(path) as f:
-            file_data = f.readlines()
-        data_index = file_data.index('@data\n')
-
-        data_arr = []
-        for sample in data.values:
-            data_str = ''
-            for j, value in enumerate(sample):
-                if(types[j] == 'nominal'):
-                    data_str += value.decode('utf-8')
-                else:
-                    data_str += str(value)
-                data_str+=','  
-            data_arr.append(data_str + '\n')  
-
-        file_data[data_index+2:] = data_arr
-        with open(path, 'w') as f:
-           f.writelines(file_data)
+                    drift["p_next"] = dataset_object.drift_points[i+1]
+                    drift["w_next"] = dataset_object.drift_widths[i+1]
+                drifts.append(drift)
 
+        # The draws are seeded from the random module, so random.seed() keeps the label switching reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        for path, first_row, last_row in dataset_files:
+            # Rows before sigmoid_start are never remapped, and a finished drift does not affect any later rows
+            active = [d for d in drifts if not d["finished"] and sigmoid_start(d["p"], d["w"]) <= last_row]
+            if not active:
+                continue
+            attributes, data_offset = read_arff_header(path)
+            classes = attributes[-1]["values"]
+            for drift in active:
+                if drift["mapping"] is None:
+                    drift["mapping"] = self._label_mapping(len(classes))
+            start_row = max(first_row, min(sigmoid_start(d["p"], d["w"]) for d in active))
+            values = [c.encode('utf-8') for c in classes]
+            if len(set(len(v) for v in values)) == 1:
+                self._patch_arff_labels(active, values, path, data_offset, first_row, start_row, rng)
+            else:
+                self._rewrite_arff_labels(active, values, path, data_offset, first_row, start_row, rng)
 
+    # labels holds the rows from first_row on. Every drift draws only from the first row it can affect
+    def _apply_label_drifts(self, drifts: list[dict], labels: np.ndarray, first_row: int, rng: np.random.Generator):
+        for drift in drifts:
+            start = max(first_row, sigmoid_start(drift["p"], drift["w"]))
+            if drift["finished"] or start >= first_row + len(labels):
+                continue
+            drift["finished"] = self._apply_label_drift(labels[start - first_row:], drift["p"], drift["w"], drift["mapping"], rng, drift["p_next"], drift["w_next"], start)
 
-    def _validate_MOA(self):
-        command = (
+    def _label_mapping(self, num_classes: int) -> np.ndarray:
+        classes = list(range(num_classes))
+        if num_classes < 2:
+            return np.array(classes)
+        perm = classes.copy()
+        while(perm == classes):
+            random.shuffle(perm)
+        return np.array(perm)
+
+    def _apply_label_drift(self, labels: np.ndarray, p:int, w:int, mapping:np.ndarray, rng: np.random.Generator, p_next: int|None = None, w_next: int|None = None, first_row: int = 1) -> bool:
+        i = np.arange(first_row, first_row + len(labels), dtype=np.float64)
+        prob = sigmoid_array(i, p, w)
+        finished = False
+
+        #handle early exit if the next drift is likely to take effect
+        if(p_next):
+            #probabilty that the sample was classified by the next classification function
+            next_prob = sigmoid_array(i, p_next, w_next)
+            #If our current drift already occured, and its probability is within the margin of the probability of the next drift, stop
+            stop = np.flatnonzero((prob > 0.99) & (prob - next_prob < 0.01))
+            if len(stop) > 0:
+                prob = prob[:stop[0]]
+                finished = True
+
+        affected = labels[:len(prob)]
+        switch = (rng.random(len(prob)) < prob) & (affected >= 0)
+        affected[switch] = mapping[affected[switch]]
+        return finished
+
+    #Fast path for class values of equal byte length: the file is never parsed, and only the class field of the changed rows is overwritten in place
+    def _patch_arff_labels(self, drifts: list[dict], values: list[bytes], path: str, data_offset: int, first_row: int, start_row: int, rng: np.random.Generator):
+        table = np.frombuffer(b"".join(values), dtype=np.uint8).reshape(len(values), len(values[0]))
+        buf = np.memmap(path, dtype=np.uint8, mode="r+")
+        try:
+            for field_starts, _, original, labels in self._switch_label_chunks(buf, data_offset, first_row, start_row, drifts, values, rng):
+                changed = np.flatnonzero(original != labels)
+                changed_starts = field_starts[changed]
+                for j in range(table.shape[1]):
+                    buf[changed_starts + j] = table[labels[changed], j]
+            buf.flush()
+        finally:
+            del buf
+
+    #Yields the class fields of the rows from start_row on, with their original and switched labels, one chunk of whole lines at a time until all drifts are finished
+    #Rows before start_row are only counted, so the memory used does not depend on the size of the file
+    def _switch_label_chunks(self, buf: np.ndarray, data_offset: int, first_row: int, start_row: int, drifts: list[dict], values: list[bytes], rng: np.random.Generator):
+        row = first_row
+        for start, end in self._data_chunks(buf, data_offset):
+            if all(d["finished"] for d in drifts):
+                return
+            if row < start_row:
+                count = self._count_data_rows(buf[start:end])
+                if row + count <= start_row:
+                    row += count
+                    continue
+            row_starts, content_ends = self._data_rows(buf, start, end)
+            skip = max(start_row - row, 0)
+            field_starts, field_ends, original = self._class_fields(buf, start, end, row_starts[skip:], content_ends[skip:], values)
+            labels = original.copy()
+            self._apply_label_drifts(drifts, labels, row + skip, rng)
+            yield (field_starts, field_ends, original, labels)
+            row += len(row_starts)
+
+    #Ranges of whole lines of the data section, of about PATCH_SCAN_CHUNK bytes each
+    def _data_chunks(self, buf: np.ndarray, data_offset: int):
+        size = len(buf)
+        start = data_offset
+        while start < size:
+            end = min(start + MOAHandler.PATCH_SCAN_CHUNK, size)
+            if end < size:
+                end = self._line_end(buf, start, end)
+            yield (start, end)
+            start = end
+
+    #Offset right after the last \n in [start, end), searched backwards in small windows since lines are short. If there is none, the line is longer than a chunk and its end is searched forward
+    def _line_end(self, buf: np.ndarray, start: int, end: int) -> int:
+        window_end = end
+        while window_end > start:
+            window_start = max(start, window_end - MOAHandler.LINE_SEARCH_WINDOW)
+            found = np.flatnonzero(buf[window_start:window_end] == ord("\n"))
+            if len(found) > 0:
+                return window_start + int(found[-1]) + 1
+            window_end = window_start
+        while end < len(buf):
+            window_end = min(end + MOAHandler.LINE_SEARCH_WINDOW, len(buf))
+            found = np.flatnonzero(buf[end:window_end] == ord("\n"))
+            if len(found) > 0:
+                return end + int(found[0]) + 1
+            end = window_end
+        return end
+
+    #Number of non-empty lines in a chunk of whole lines, without locating them. Empty lines hold nothing but an optional \r
+    def _count_data_rows(self, chunk: np.ndarray) -> int:
+        newline = chunk == ord("\n")
+        lines = int(np.count_nonzero(newline)) + int(chunk[-1] != ord("\n"))
+        line_start = np.empty_like(newline)
+        line_start[0] = True
+        line_start[1:] = newline[:-1]
+        empty = np.count_nonzero(newline & line_start)
+        empty += np.count_nonzero(newline[1:] & (chunk[:-1] == ord("\r")) & line_start[:-1])
+        return lines - int(empty)
+
+    #Start and end (without the line ending) of every non-empty line in a chunk of whole lines
+    def _data_rows(self, buf: np.ndarray, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+        ends = np.flatnonzero(buf[start:end] == ord("\n")) + start
+        if buf[end - 1] != ord("\n"):
+            ends = np.append(ends, end)
+        starts = np.concatenate(([start], ends[:-1] + 1))
+        content_ends = ends.copy()
+        nonempty = content_ends > starts
+        content_ends[nonempty] -= buf[content_ends[nonempty] - 1] == ord("\r")
+        nonempty = content_ends > starts
+        return (starts[nonempty], content_ends[nonempty])
+
+    #Locates the class field of every row, the last field before the comma MOA writes at the end of every row, and decodes it by matching its bytes against the class values
+    #Fields holding none of the values, e.g. missing values, get the code -1 and are never switched
+    def _class_fields(self, buf: np.ndarray, start: int, end: int, row_starts: np.ndarray, content_ends: np.ndarray, values: list[bytes]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        field_ends = content_ends - (buf[content_ends - 1] == ord(","))
+        commas = np.flatnonzero(buf[start:end] == ord(",")) + start
+        last = np.searchsorted(commas, field_ends) - 1
+        field_starts = row_starts.copy()
+        has_comma = last >= 0
+        field_starts[has_comma] = np.maximum(commas[last[has_comma]] + 1, row_starts[has_comma])
+        del commas
+
+        codes = np.full(len(row_starts), -1, dtype=np.int64)
+        lengths = field_ends - field_starts
+        for code, value in enumerate(values):
+            candidates = np.flatnonzero(lengths == len(value))
+            for j, byte in enumerate(value):
+                candidates = candidates[buf[field_starts[candidates] + j] == byte]
+            codes[candidates] = code
+        return (field_starts, field_ends, codes)
+
+    #Important to fit format of arff file generated by MOA. The file is copied as is, except for the class field of the changed rows, so all other bytes, including the comma ending every row and the line endings, are kept exactly as written by MOA
+    #Produces the same file as _patch_arff_labels would, for class values whose byte lengths differ
+    def _rewrite_arff_labels(self, drifts: list[dict], values: list[bytes], path: str, data_offset: int, first_row: int, start_row: int, rng: np.random.Generator):
+        tmp_path = path + ".tmp"
+        buf = np.memmap(path, dtype=np.uint8, mode="r")
+        try:
+            data = memoryview(buf)
+            with open(tmp_path, "wb") as dst:
+                cursor = 0
+                for field_starts, field_ends, original, labels in self._switch_label_chunks(buf, data_offset, first_row, start_row, drifts, values, rng):
+                    changed = np.flatnonzero(original != labels)
+                    for field_start, field_end, label in zip(field_starts[changed].tolist(), field_ends[changed].tolist(), labels[changed].tolist()):
+                        dst.write(data[cursor:field_start])
+                        dst.write(values[label])
+                        cursor = field_end
+                dst.write(data[cursor:])
+            data.release()
+        finally:
+            del buf
+        os.replace(tmp_path, path)
+
+    def _base_command(self) -> str:
+        return (
             self._java_executable
             + " -cp "
             + self._MOA_path
@@ -159,6 +564,9 @@ class MOAHandler:
             + self._MOA_path
             + "/lib/sizeofag-1.1.0.jar moa.DoTask"
         )
+
+    def _validate_MOA(self):
+        command = self._base_command()
         try:
             execute_command(command)
         except Exception as e:
@@ -166,6 +574,16 @@ class MOAHandler:
                 f"MOA couldn't be called. Make sure the information within config file is correct. Attempted command:\n{command}"
             )
 
+    def _build_stream(self, dataset_object: DatasetObject) -> str:
+        if len(dataset_object.classification_functions) == 1:
+            return f"(generators.{dataset_object.get_generator_name()} -f {str(dataset_object.classification_functions[0])})"
+        return self._build_command(
+            dataset_object.get_generator_name(),
+            dataset_object.classification_functions,
+            dataset_object.drift_points,
+            dataset_object.drift_widths,
+        )
+
     def _build_command(
         self,
         generator: str,
@@ -173,11 +591,11 @@ class MOAHandler:
         drift_points: list[int],
         drift_widths: list[int],
     ) -> str:
-        res = "-s (ConceptDriftStream "
+        res = "(ConceptDriftStream "
         if len(drift_points) < 2:
             res += f"-s (generators.{generator} -f {str(classification_functions[0])}) -d (generators.{generator} -f {str(classification_functions[1])})"
         else:
-            res += (
+            res += "-s " + (
                 self._build_command(
                     generator,
                     classification_functions[:-1],
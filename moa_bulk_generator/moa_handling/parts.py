@@ -0,0 +1,150 @@
+import json
+import math
+import os
+from ..dataset_defs import DatasetObject
+from ..arff_handling import read_arff_header
+from .types import PartDict, PartDriftDict, PartIndexDict
+
+
+def part_path(path: str, index: int) -> str:
+    """
+    Returns the path of a given part file of a dataset.
+
+    Parameters:
+        path (str): Path of the (unsplit) dataset file
+        index (int): Index of the part, starting at 0
+
+    Returns:
+        str: Path like: out/Agrawal_f_1_s_1000.part00000.arrf
+    """
+    base = path[: -len(".arrf")] if path.endswith(".arrf") else path
+    return f"{base}.part{index:05d}.arrf"
+
+
+def index_path(path: str) -> str:
+    """
+    Returns the path of the index file describing the parts of a dataset.
+
+    Parameters:
+        path (str): Path of the (unsplit) dataset file
+
+    Returns:
+        str: Path like: out/Agrawal_f_1_s_1000.arrf.index.json
+    """
+    return path + ".index.json"
+
+
+def split_dataset_file(
+    dataset_object: DatasetObject,
+    path: str,
+    part_rows: int | None = None,
+    part_bytes: int | None = None,
+) -> PartIndexDict:
+    """
+    Splits a generated ARFF file into part files, each a valid ARFF file with the full header, and writes an index file recording the row range of every part and the parts overlapping every drift area. The original file is removed afterwards.
+    A part is closed as soon as it reaches part_rows rows, or before a row that would take its data over part_bytes bytes, whichever comes first. Rows are never split between parts, so a part only exceeds part_bytes if it consists of a single row longer than part_bytes.
+
+    Parameters:
+        dataset_object (DatasetObject): Definition of the dataset. Used to locate the drift areas
+        path (str): Path to the generated ARFF file
+        part_rows (int | None): Maximal number of rows per part. Can be None if parts should be limited only by size
+        part_bytes (int | None): Maximal size of data per part in bytes. Can be None if parts should be limited only by row count
+
+    Returns:
+        PartIndexDict: The index written next to the dataset
+    """
+    if part_rows is None and part_bytes is None:
+        raise Exception("Either part_rows or part_bytes must be specified")
+    if (part_rows is not None and part_rows < 1) or (part_bytes is not None and part_bytes < 1):
+        raise Exception("Part size must be above 0")
+
+    _, data_offset = read_arff_header(path)
+    parts: list[PartDict] = []
+    rows = 0
+    out = None
+    with open(path, "rb") as src:
+        # MOA separates the @data line from the samples with an empty line, which every part keeps
+        header = src.read(data_offset) + b"\n"
+        for line in src:
+            if not line.strip():
+                continue
+            if out is not None and part_bytes is not None and data_bytes + len(line) > part_bytes:
+                out.close()
+                out = None
+                part["bytes"] = len(header) + data_bytes
+                parts.append(part)
+            if out is None:
+                part_file = part_path(path, len(parts))
+                out = open(part_file, "wb")
+                out.write(header)
+                part: PartDict = {"file": os.path.basename(part_file), "first_row": rows + 1, "last_row": rows, "rows": 0, "bytes": 0}
+                data_bytes = 0
+            out.write(line)
+            rows += 1
+            part["rows"] += 1
+            part["last_row"] = rows
+            data_bytes += len(line)
+            if (part_rows is not None and part["rows"] >= part_rows) or (part_bytes is not None and data_bytes >= part_bytes):
+                out.close()
+                out = None
+                part["bytes"] = len(header) + data_bytes
+                parts.append(part)
+        if out is not None:
+            out.close()
+            part["bytes"] = len(header) + data_bytes
+            parts.append(part)
+    os.remove(path)
+
+    drifts: list[PartDriftDict] = []
+    for p, w in zip(dataset_object.drift_points, dataset_object.drift_widths):
+        ofset = math.ceil(w / 2)
+        first_row = p - ofset
+        last_row = p + ofset
+        drifts.append({
+            "point": p,
+            "width": w,
+            "first_row": first_row,
+            "last_row": last_row,
+            "parts": [i for i, part in enumerate(parts) if part["first_row"] <= last_row and part["last_row"] >= first_row],
+        })
+
+    index: PartIndexDict = {
+        "dataset": dataset_object.to_string(),
+        "rows": rows,
+        "parts": parts,
+        "drifts": drifts,
+    }
+    with open(index_path(path), "w") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def load_part_index(path: str) -> PartIndexDict:
+    """
+    Loads the index of a dataset split into parts.
+
+    Parameters:
+        path (str): Path of the (unsplit) dataset file, or of the index file itself
+
+    Returns:
+        PartIndexDict: The loaded index
+    """
+    if not path.endswith(".index.json"):
+        path = index_path(path)
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_parts(index: PartIndexDict, first_row: int, last_row: int) -> list[PartDict]:
+    """
+    Selects the parts containing any of the rows within a given range, e.g. a drift area.
+
+    Parameters:
+        index (PartIndexDict): Index of the dataset
+        first_row (int): First row of the range, counted from 1
+        last_row (int): Last row of the range (inclusive)
+
+    Returns:
+        list[PartDict]: The overlapping parts, in order
+    """
+    return [part for part in index["parts"] if part["first_row"] <= last_row and part["last_row"] >= first_row]
@@ -0,0 +1,131 @@
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+from ..dataset_defs import DatasetObject
+
+
+class PipelinedExecutor:
+    """
+    A class running a batch of datasets through two stages: a generation stage running MOA and a post-processing stage running in Python (splitting into parts, switching drifts, statistics). Every stage has its own pool of worker threads, and the stages are connected by a bounded queue, so generating the next dataset overlaps with post-processing the previous one.
+    The queue provides backpressure: a generation worker that finished a dataset waits until there is room in the queue, so at most generation_workers + queue_size + post_processing_workers datasets are generated but not yet post-processed at any time.
+    If any job fails, no new jobs are started and the first error is raised once the running jobs have finished.
+    """
+    # Seconds between checks whether the pipeline was stopped, while waiting on the queue
+    POLL_INTERVAL: float = 0.1
+
+    _generate: Callable[[DatasetObject], Any]
+    _post_process: Callable[[DatasetObject, Any], Any]
+    _generation_workers: int
+    _post_processing_workers: int
+    _queue_size: int
+
+    def __init__(
+        self,
+        generate: Callable[[DatasetObject], Any],
+        post_process: Callable[[DatasetObject, Any], Any],
+        generation_workers: int = 1,
+        post_processing_workers: int = 1,
+        queue_size: int = 1,
+    ):
+        """
+        PipelinedExecutor initialization.
+
+        Parameters:
+            generate (Callable[[DatasetObject], Any]): Generation stage. Its result is passed to the post-processing stage
+            post_process (Callable[[DatasetObject, Any], Any]): Post-processing stage, called with the dataset and the result of the generation stage
+            generation_workers (int): Number of datasets generated at the same time
+            post_processing_workers (int): Number of datasets post-processed at the same time
+            queue_size (int): Number of generated datasets that can wait for post-processing
+        """
+        if generation_workers < 1 or post_processing_workers < 1 or queue_size < 1:
+            raise Exception("Number of workers and queue size must be above 0")
+        self._generate = generate
+        self._post_process = post_process
+        self._generation_workers = generation_workers
+        self._post_processing_workers = post_processing_workers
+        self._queue_size = queue_size
+
+    def run(self, datasets: list[DatasetObject]) -> dict[DatasetObject, Any]:
+        """
+        Runs all datasets through both stages and waits until they are finished.
+
+        Parameters:
+            datasets (list[DatasetObject]): Datasets to process. Generation starts in this order
+
+        Returns:
+            dict[DatasetObject, Any]: Results of the post-processing stage, in the order of datasets
+        """
+        jobs: queue.Queue = queue.Queue()
+        for dataset in datasets:
+            jobs.put(dataset)
+        handoff: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        results: dict[DatasetObject, Any] = {}
+        errors: list[BaseException] = []
+        stop = threading.Event()
+        generation_done = threading.Event()
+        lock = threading.Lock()
+
+        def fail(e: BaseException):
+            with lock:
+                errors.append(e)
+            stop.set()
+
+        def generation_worker():
+            while not stop.is_set():
+                try:
+                    dataset = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    generated = self._generate(dataset)
+                except BaseException as e:
+                    fail(e)
+                    return
+                while not stop.is_set():
+                    try:
+                        handoff.put((dataset, generated), timeout=PipelinedExecutor.POLL_INTERVAL)
+                        break
+                    except queue.Full:
+                        continue
+
+        def post_processing_worker():
+            while not stop.is_set():
+                try:
+                    dataset, generated = handoff.get(timeout=PipelinedExecutor.POLL_INTERVAL)
+                except queue.Empty:
+                    # All generation workers have exited, so nothing more will be queued
+                    if generation_done.is_set() and handoff.empty():
+                        return
+                    continue
+                try:
+                    result = self._post_process(dataset, generated)
+                except BaseException as e:
+                    fail(e)
+                    return
+                with lock:
+                    results[dataset] = result
+
+        generation_threads = [
+            threading.Thread(target=generation_worker, daemon=True)
+            for _ in range(min(self._generation_workers, max(len(datasets), 1)))
+        ]
+        post_processing_threads = [
+            threading.Thread(target=post_processing_worker, daemon=True)
+            for _ in range(self._post_processing_workers)
+        ]
+        for thread in generation_threads + post_processing_threads:
+            thread.start()
+        try:
+            for thread in generation_threads:
+                thread.join()
+            generation_done.set()
+            for thread in post_processing_threads:
+                thread.join()
+        except BaseException:
+            # e.g. KeyboardInterrupt, running jobs are finished but no new ones are started
+            stop.set()
+            raise
+        if errors:
+            raise errors[0]
+        return {dataset: results[dataset] for dataset in datasets if dataset in results}
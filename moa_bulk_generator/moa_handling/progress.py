@@ -0,0 +1,224 @@
+import json
+import os
+import sys
+import threading
+import time
+from typing import TextIO
+from ..dataset_defs import DatasetObject
+from .types import JobFileDict, JobProgressDict
+from .utils import format_duration
+
+_READ_CHUNK = 1 << 20
+
+
+class ProgressReporter:
+    """
+    A class reporting live progress of a batch of datasets being generated. Progress of every running job is measured by following the growth of the ARFF files MOA writes for it and counting the rows written so far, so MOA itself does not have to report anything.
+    When the output stream is a terminal, a single status line is redrawn in place. Otherwise a JSON object is printed per line at a fixed interval, so the output can be parsed by other tools.
+    """
+    _stream: TextIO
+    _tty: bool
+    _interval: float
+    _jobs: dict[str, JobProgressDict]
+    _total_jobs: int
+    _total_rows: int
+    _done_jobs: int
+    _done_rows: int
+    _rate: float
+    _last_sample: tuple[float, int]
+    _start_time: float
+    _lock: threading.Lock
+    _stop: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(
+        self,
+        datasets: list[DatasetObject],
+        stream: TextIO | None = None,
+        interval: float | None = None,
+    ):
+        """
+        ProgressReporter initialization.
+
+        Parameters:
+            datasets (list[DatasetObject]): All datasets of the batch. Used to compute the overall completion
+            stream (TextIO | None): Stream the progress is written to. By default sys.stdout
+            interval (float | None): Number of seconds between two progress updates. By default 0.5 for terminals and 10 otherwise
+        """
+        self._stream = stream if stream is not None else sys.stdout
+        self._tty = hasattr(self._stream, "isatty") and self._stream.isatty()
+        if interval is None:
+            interval = 0.5 if self._tty else 10.0
+        self._interval = interval
+        self._jobs = {}
+        self._total_jobs = len(datasets)
+        self._total_rows = sum(d.num_of_samples for d in datasets)
+        self._done_jobs = 0
+        self._done_rows = 0
+        self._rate = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the background thread periodically measuring and printing the progress.
+        """
+        self._start_time = time.monotonic()
+        self._last_sample = (self._start_time, 0)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """
+        Stops the background thread and prints the final state of the batch.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._render()
+        if self._tty:
+            self._stream.write("\n")
+            self._stream.flush()
+
+    def start_job(self, dataset: DatasetObject, path: str, files: list[str] | None = None):
+        """
+        Registers a dataset whose generation has just started.
+
+        Parameters:
+            dataset (DatasetObject): Dataset being generated
+            path (str): Path of the ARFF file the dataset is written to
+            files (list[str] | None): ARFF files MOA writes the rows of the dataset to, if these are not path itself, e.g. the stream files of the flat drift strategy. Rows of all files count toward the job. Files that do not exist (yet) count as empty. By default path
+        """
+        name = dataset.to_string()
+        with self._lock:
+            self._jobs[name] = {
+                "path": path,
+                "total": dataset.num_of_samples,
+                "rows": 0,
+                "files": [self._job_file(f) for f in (files if files is not None else [path])],
+            }
+        self._log({"event": "start", "dataset": name, "path": path}, f"generating {name} to {os.path.dirname(path)}...")
+
+    def finish_job(self, dataset: DatasetObject):
+        """
+        Marks a dataset as fully generated.
+
+        Parameters:
+            dataset (DatasetObject): Dataset that has been generated
+        """
+        name = dataset.to_string()
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            self._done_jobs += 1
+            self._done_rows += dataset.num_of_samples
+        if job is not None and not self._tty:
+            self._log({"event": "finish", "dataset": name}, "")
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self._render()
+
+    def _render(self):
+        with self._lock:
+            for job in self._jobs.values():
+                self._update_rows(job)
+            state = self._snapshot()
+        if self._tty:
+            self._stream.write("\r" + self._format_line(state) + "\x1b[K")
+        else:
+            self._stream.write(json.dumps(state) + "\n")
+        self._stream.flush()
+
+    def _snapshot(self) -> dict:
+        now = time.monotonic()
+        running_rows = sum(job["rows"] for job in self._jobs.values())
+        rows = self._done_rows + running_rows
+
+        # Exponentially smoothed current throughput, the overall average is used as long as no sample exists yet
+        last_time, last_rows = self._last_sample
+        if now - last_time > 0:
+            current = max(rows - last_rows, 0) / (now - last_time)
+            self._rate = current if self._rate == 0 else 0.3 * current + 0.7 * self._rate
+        self._last_sample = (now, rows)
+
+        elapsed = now - self._start_time
+        average = rows / elapsed if elapsed > 0 else 0.0
+        rate = self._rate if self._rate > 0 else average
+        eta = (self._total_rows - rows) / rate if rate > 0 else None
+        return {
+            "event": "progress",
+            "jobs_done": self._done_jobs,
+            "jobs_total": self._total_jobs,
+            "rows": rows,
+            "rows_total": self._total_rows,
+            "percent": round(100.0 * rows / self._total_rows, 2) if self._total_rows else 100.0,
+            "rows_per_s": round(rate, 1),
+            "elapsed_s": round(elapsed, 1),
+            "eta_s": round(eta, 1) if eta is not None else None,
+            "active": [
+                {"dataset": name, "rows": job["rows"], "total": job["total"]}
+                for name, job in self._jobs.items()
+            ],
+        }
+
+    def _format_line(self, state: dict) -> str:
+        line = f"[{state['jobs_done']}/{state['jobs_total']}] {state['percent']:.1f}% | {state['rows_per_s']:,.0f} rows/s | ETA {format_duration(state['eta_s'])}"
+        if state["active"]:
+            job = state["active"][0]
+            line += f" | {job['dataset']}: {job['rows']:,}/{job['total']:,}"
+            if len(state["active"]) > 1:
+                line += f" (+{len(state['active']) - 1} more)"
+        return line
+
+    def _log(self, event: dict, message: str):
+        with self._lock:
+            if self._tty:
+                if message:
+                    self._stream.write("\r\x1b[K" + message + "\n")
+            else:
+                self._stream.write(json.dumps(event) + "\n")
+            self._stream.flush()
+
+    def _job_file(self, path: str) -> JobFileDict:
+        return {"path": path, "rows": 0, "offset": 0, "data_found": False, "blank_skipped": False, "header": b""}
+
+    def _update_rows(self, job: JobProgressDict):
+        for job_file in job["files"]:
+            self._update_file_rows(job_file)
+        job["rows"] = min(sum(job_file["rows"] for job_file in job["files"]), job["total"])
+
+    def _update_file_rows(self, job: JobFileDict):
+        # Only the bytes appended since the previous update are read, so the cost is proportional to the output and not to the number of updates
+        try:
+            with open(job["path"], "rb") as f:
+                f.seek(job["offset"])
+                while True:
+                    chunk = f.read(_READ_CHUNK)
+                    if not chunk:
+                        break
+                    job["offset"] += len(chunk)
+                    self._count_rows(job, chunk)
+        except OSError:
+            return
+
+    def _count_rows(self, job: JobFileDict, chunk: bytes):
+        if not job["data_found"]:
+            job["header"] += chunk
+            index = job["header"].find(b"@data")
+            if index < 0:
+                return
+            line_end = job["header"].find(b"\n", index)
+            if line_end < 0:
+                return
+            chunk = job["header"][line_end + 1:]
+            job["header"] = b""
+            job["data_found"] = True
+        # MOA separates the @data line from the samples with a single empty line
+        if not job["blank_skipped"] and chunk:
+            job["blank_skipped"] = True
+            if chunk[:1] in (b"\n", b"\r"):
+                chunk = chunk[chunk.find(b"\n") + 1:]
+        job["rows"] += chunk.count(b"\n")
+
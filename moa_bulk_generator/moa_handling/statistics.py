@@ -0,0 +1,240 @@
+import json
+import math
+import numpy as np
+import pandas as pd
+from ..dataset_defs import DatasetObject
+from ..arff_handling import read_arff_header, read_arff_data
+from .types import DatasetStatisticsDict, DriftStatisticsDict, RegionStatisticsDict
+
+
+class DatasetStatistics:
+    """
+    A class computing drift-verification statistics of a generated dataset in a single streaming pass over its ARFF file. The file is read in chunks of fixed size, so memory usage does not depend on the number of samples.
+    Computed statistics:
+        1. Class histograms over a fixed number of equally sized windows
+        2. Class histograms and label change rates (fraction of consecutive samples with different labels) before, during and after every drift area, together with the total variation distance between class distributions before and after the drift
+        3. Per-attribute summaries: count, mean, standard deviation, minimum and maximum for numeric attributes and value counts for nominal attributes
+    """
+    MAX_WINDOWS: int = 100
+    CHUNK_SIZE: int = 100000
+    # Minimal number of samples compared on each side of a drift area
+    MIN_REGION_ROWS: int = 1000
+
+    _dataset_object: DatasetObject
+    _path: str
+    _data_files: list[str]
+    _statistics: DatasetStatisticsDict | None
+
+    def __init__(self, dataset_object: DatasetObject, path: str, data_files: list[str] | None = None):
+        """
+        DatasetStatistics initialization.
+
+        Parameters:
+            dataset_object (DatasetObject): Definition of the generated dataset. Used to locate the drift areas
+            path (str): Path to the generated ARFF file. The sidecar file is written next to it
+            data_files (list[str] | None): Part files containing the data of the dataset, in order. Can be None if the data is stored in a single file under path
+        """
+        self._dataset_object = dataset_object
+        self._path = path
+        self._data_files = data_files if data_files is not None else [path]
+        self._statistics = None
+
+    def compute(self) -> DatasetStatisticsDict:
+        """
+        Reads the dataset once and computes all the statistics.
+
+        Returns:
+            DatasetStatisticsDict: Computed statistics
+        """
+        attributes, _ = read_arff_header(self._data_files[0])
+        classes = attributes[-1]["values"]
+        num_classes = len(classes)
+        window_size = max(1, math.ceil(self._dataset_object.num_of_samples / DatasetStatistics.MAX_WINDOWS))
+        num_windows = math.ceil(self._dataset_object.num_of_samples / window_size)
+        windows = np.zeros(num_windows * num_classes, dtype=np.int64)
+
+        regions = self._drift_regions()
+        region_counts = [np.zeros(num_classes, dtype=np.int64) for _ in regions]
+        region_changes = [[0, 0] for _ in regions]
+        summaries = [self._empty_summary(attribute) for attribute in attributes]
+
+        rows = 0
+        last_label = None
+        for chunk in self._read_chunks():
+            start = rows
+            end = rows + len(chunk)
+            for j, attribute in enumerate(attributes):
+                self._update_summary(summaries[j], attribute, chunk.iloc[:, j])
+
+            labels = chunk.iloc[:, -1].cat.codes.to_numpy().astype(np.int64)
+            known = labels >= 0
+            window_index = np.minimum(np.arange(start, end) // window_size, num_windows - 1)
+            windows += np.bincount(
+                window_index[known] * num_classes + labels[known],
+                minlength=num_windows * num_classes,
+            )[: num_windows * num_classes]
+
+            # changes[i] tells whether row start+i has a different label than the row preceding it
+            previous = np.empty_like(labels)
+            previous[1:] = labels[:-1]
+            previous[0] = labels[0] if last_label is None else last_label
+            changes = labels != previous
+            last_label = labels[-1]
+
+            for k, (region_start, region_end) in enumerate(regions):
+                lo = max(region_start, start)
+                hi = min(region_end, end)
+                if lo >= hi:
+                    continue
+                region_labels = labels[lo - start:hi - start]
+                region_counts[k] += np.bincount(region_labels[region_labels >= 0], minlength=num_classes)
+                # Only transitions where both samples belong to the region are counted
+                lo = max(lo, region_start + 1)
+                if lo < hi:
+                    region_changes[k][0] += int(changes[lo - start:hi - start].sum())
+                    region_changes[k][1] += hi - lo
+            rows = end
+
+        drifts = []
+        for i in range(len(self._dataset_object.drift_points)):
+            before, during, after = [
+                self._region_statistics(regions[3 * i + r], region_counts[3 * i + r], region_changes[3 * i + r])
+                for r in range(3)
+            ]
+            drift: DriftStatisticsDict = {
+                "point": self._dataset_object.drift_points[i],
+                "width": self._dataset_object.drift_widths[i],
+                "functions": [self._dataset_object.classification_functions[i], self._dataset_object.classification_functions[i + 1]],
+                "switching": self._dataset_object.classification_functions[i] == self._dataset_object.classification_functions[i + 1],
+                "before": before,
+                "during": during,
+                "after": after,
+                "distribution_shift": self._distribution_shift(before["histogram"], after["histogram"]),
+            }
+            drifts.append(drift)
+
+        self._statistics = {
+            "dataset": self._dataset_object.to_string(),
+            "rows": rows,
+            "classes": classes,
+            "window_size": window_size,
+            "windows": windows.reshape(num_windows, num_classes).tolist(),
+            "drifts": drifts,
+            "attributes": {
+                attribute["name"]: self._finalize_summary(summary)
+                for attribute, summary in zip(attributes, summaries)
+            },
+        }
+        return self._statistics
+
+    def save(self) -> str:
+        """
+        Writes the computed statistics as a compact JSON sidecar file next to the dataset. Computes the statistics first if needed.
+
+        Returns:
+            str: Path to the written sidecar file
+        """
+        if self._statistics is None:
+            self.compute()
+        sidecar_path = self._path + ".stats.json"
+        with open(sidecar_path, "w") as f:
+            json.dump(self._statistics, f, separators=(",", ":"))
+        return sidecar_path
+
+    def summary(self) -> str:
+        """
+        Returns a single-line summary of the statistics, suitable for the run log. Computes the statistics first if needed.
+
+        Returns:
+            str: Summary like: Agrawal_f_1_2_p_500_w_10_s_1000: 1000 rows, drift 1 at 500: shift 0.412, change rate 0.48->0.52
+        """
+        if self._statistics is None:
+            self.compute()
+        res = f"{self._statistics['dataset']}: {self._statistics['rows']} rows"
+        for i, drift in enumerate(self._statistics["drifts"]):
+            res += f", drift {i + 1} at {drift['point']}: shift {_format_optional(drift['distribution_shift'])}"
+            res += f", change rate {_format_optional(drift['before']['label_change_rate'])}->{_format_optional(drift['after']['label_change_rate'])}"
+        return res
+
+    def _read_chunks(self):
+        for data_file in self._data_files:
+            yield from read_arff_data(data_file, chunksize=DatasetStatistics.CHUNK_SIZE)
+
+    def _drift_regions(self) -> list[tuple[int, int]]:
+        # Three half-open, 0-based row ranges per drift: before, during and after the drift area
+        regions = []
+        points = self._dataset_object.drift_points
+        widths = self._dataset_object.drift_widths
+        areas = []
+        for p, w in zip(points, widths):
+            ofset = math.ceil(w / 2)
+            areas.append((p - ofset, p + ofset))
+        for i, (lower, upper) in enumerate(areas):
+            span = max(upper - lower + 1, DatasetStatistics.MIN_REGION_ROWS)
+            previous_upper = areas[i - 1][1] if i > 0 else 0
+            next_lower = areas[i + 1][0] if i < len(areas) - 1 else self._dataset_object.num_of_samples + 1
+            regions.append((max(previous_upper, lower - 1 - span), lower - 1))
+            regions.append((lower - 1, upper))
+            regions.append((upper, min(next_lower - 1, upper + span)))
+        return regions
+
+    def _region_statistics(self, region: tuple[int, int], counts: np.ndarray, changes: list[int]) -> RegionStatisticsDict:
+        return {
+            "start": region[0] + 1,
+            "end": region[1],
+            "rows": int(counts.sum()),
+            "histogram": counts.tolist(),
+            "label_change_rate": changes[0] / changes[1] if changes[1] > 0 else None,
+        }
+
+    def _distribution_shift(self, before: list[int], after: list[int]) -> float | None:
+        total_before = sum(before)
+        total_after = sum(after)
+        if total_before == 0 or total_after == 0:
+            return None
+        return 0.5 * sum(abs(b / total_before - a / total_after) for b, a in zip(before, after))
+
+    def _empty_summary(self, attribute) -> dict:
+        if attribute["type"] == "nominal":
+            return {"type": "nominal", "counts": np.zeros(len(attribute["values"]), dtype=np.int64)}
+        return {"type": "numeric", "count": 0, "mean": 0.0, "m2": 0.0, "min": math.inf, "max": -math.inf}
+
+    def _update_summary(self, summary: dict, attribute, column: pd.Series):
+        if attribute["type"] == "nominal":
+            codes = column.cat.codes.to_numpy()
+            summary["counts"] += np.bincount(codes[codes >= 0], minlength=len(attribute["values"]))
+            return
+        values = column.to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        # Chan et al. parallel update of mean and sum of squared deviations
+        n_a = summary["count"]
+        n_b = len(values)
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        delta = mean_b - summary["mean"]
+        n = n_a + n_b
+        summary["mean"] += delta * n_b / n
+        summary["m2"] += m2_b + delta * delta * n_a * n_b / n
+        summary["count"] = n
+        summary["min"] = min(summary["min"], float(values.min()))
+        summary["max"] = max(summary["max"], float(values.max()))
+
+    def _finalize_summary(self, summary: dict) -> dict:
+        if summary["type"] == "nominal":
+            return {"type": "nominal", "counts": summary["counts"].tolist()}
+        if summary["count"] == 0:
+            return {"type": "numeric", "count": 0, "mean": None, "std": None, "min": None, "max": None}
+        return {
+            "type": "numeric",
+            "count": summary["count"],
+            "mean": summary["mean"],
+            "std": math.sqrt(summary["m2"] / summary["count"]),
+            "min": summary["min"],
+            "max": summary["max"],
+        }
+
+
+def _format_optional(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.3f}"
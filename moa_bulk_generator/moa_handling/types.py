@@ -0,0 +1,96 @@
+from typing import TypedDict
+
+
+class JobFileDict(TypedDict):
+    path: str
+    rows: int
+    offset: int
+    data_found: bool
+    blank_skipped: bool
+    header: bytes
+
+
+class JobProgressDict(TypedDict):
+    path: str
+    total: int
+    rows: int
+    files: list[JobFileDict]
+
+
+class RunMetricsDict(TypedDict):
+    generator: str
+    num_of_samples: int
+    switching_drift: bool
+    seconds: float
+    size_bytes: int
+    jvm_peak_memory_bytes: int | None
+
+
+class CostEstimateDict(TypedDict):
+    size_bytes: int
+    seconds: float
+    peak_memory_bytes: int
+
+
+class RegionStatisticsDict(TypedDict):
+    start: int
+    end: int
+    rows: int
+    histogram: list[int]
+    label_change_rate: float | None
+
+
+class DriftStatisticsDict(TypedDict):
+    point: int
+    width: int
+    functions: list[int]
+    switching: bool
+    before: RegionStatisticsDict
+    during: RegionStatisticsDict
+    after: RegionStatisticsDict
+    distribution_shift: float | None
+
+
+class DatasetStatisticsDict(TypedDict):
+    dataset: str
+    rows: int
+    classes: list[str]
+    window_size: int
+    windows: list[list[int]]
+    drifts: list[DriftStatisticsDict]
+    attributes: dict[str, dict]
+
+
+class PartDict(TypedDict):
+    file: str
+    first_row: int
+    last_row: int
+    rows: int
+    bytes: int
+
+
+class PartDriftDict(TypedDict):
+    point: int
+    width: int
+    first_row: int
+    last_row: int
+    parts: list[int]
+
+
+class PartIndexDict(TypedDict):
+    dataset: str
+    rows: int
+    parts: list[PartDict]
+    drifts: list[PartDriftDict]
+
+
+class IndexFileDict(TypedDict):
+    path: str
+    bytes: int
+    sha256: str
+
+
+class IndexEntryDict(TypedDict):
+    dataset: str
+    path: str
+    files: list[IndexFileDict]
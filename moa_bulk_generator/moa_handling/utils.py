@@ -1,8 +1,13 @@
+import os
 import subprocess
+import sys
 import logging
+import tempfile
 from pathlib import Path
 import math
+import numpy as np
 from shlex import split
+from .types import CostEstimateDict
 
 log_path = Path(__file__).resolve().parent.parent
 logging.basicConfig(
@@ -11,32 +16,82 @@ logging.basicConfig(
     format="[%(asctime)s] [%(levelname)s] %(message)s"
 )
 logger = logging.getLogger(__name__)
+metrics_path = str(log_path) + '/metrics.jsonl'
 
 
-def execute_command( command: str):
+def execute_command( command: str) -> int | None:
     """
     Executes a given command using subprocess library. In case of error in the result of the command will raise an exception. Every command ran is logged into log.txt file.
 
     Parameters:
         command (str): String containing the command to be run
+
+    Returns:
+        int | None: Peak resident memory of the executed process in bytes, or None if it can't be measured on this platform
     """
     logger.info(f'Running command {command}')
     #TODO actually implement sensible error handling with custom exceptions
+    stdout = b""
+    stderr = b""
     try:
-        result = subprocess.run(split(command), capture_output=True)
-        if("error" in str(result.stdout).lower() or "{M}assive {O}nline {A}nalysis" not in str(result.stderr)):
+        stdout, stderr, peak = _run_measured(split(command))
+        if("error" in str(stdout).lower() or "{M}assive {O}nline {A}nalysis" not in str(stderr)):
             raise Exception()
     except Exception as e:
         if(str(e) == ''):
-            logger.error(f'std_out: {str(result.stdout)} std_err: {str(result.stderr)}')
+            logger.error(f'std_out: {str(stdout)} std_err: {str(stderr)}')
         else:
             logger.error(f'command execution failed with {e}')
         raise Exception()
-    
+    return peak
+
+
+def _run_measured(args: list[str]) -> tuple[bytes, bytes, int | None]:
+    # The output goes to temporary files, so that the process can be reaped with wait4, which reports the resource usage of this child alone
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        process = subprocess.Popen(args, stdout=out, stderr=err)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is reported in kilobytes everywhere except macOS
+            peak = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        else:
+            process.wait()
+            peak = None
+        out.seek(0)
+        err.seek(0)
+        return (out.read(), err.read(), peak)
+
 
-def sigmoid(i, p, w):
+def sigmoid_array(i: np.ndarray, p, w) -> np.ndarray:
+    """
+    Returns the probability that sample i comes from the concept after a drift centered on p with width w, 1 / (1 + e^(-4(i - p) / w)), as defined by MOA's ConceptDriftStream. Evaluated for every sample index in i.
+    """
     x = -4.0 * (i - p) / w
-    
-    if(x>=700):
-        return 0
-    return 1.0 / (1.0 + math.exp(x))
+    return np.where(x >= 700, 0.0, 1.0 / (1.0 + np.exp(np.minimum(x, 700))))
+
+
+def sigmoid_start(p, w) -> int:
+    """
+    Returns the first sample for which sigmoid_array(i, p, w) is not exactly zero, i.e. the first sample a drift centered on p with width w can affect.
+    """
+    return math.floor(p - 175.0 * w) + 1
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_size(size: float) -> str:
+    for unit in ['B', 'KiB', 'MiB', 'GiB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def format_estimate(estimate: CostEstimateDict) -> str:
+    return f"size ~{format_size(estimate['size_bytes'])}, time ~{format_duration(estimate['seconds'])}, memory ~{format_size(estimate['peak_memory_bytes'])}"